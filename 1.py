@@ -1,9 +1,81 @@
+import json
+import math
+import queue
+import threading
 import tkinter as tk
-from tkinter import messagebox
-from itertools import permutations
+from tkinter import filedialog, messagebox, simpledialog
 
+from graph_solver import (
+    BitAdjacency, GraphLibrary, IsomorphismCache, SearchControl, automorphism_group,
+    format_matrix_text, graph_to_data, invariant_mismatch, iter_isomorphisms,
+    iter_subgraph_isomorphisms, parallel_isomorphisms, parse_graph, parse_matrix_text,
+    subgraph_mismatch, vertex_name
+)
 
-LETTERS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+DRAG_FRAME_MS = 16
+POLL_MS = 50
+MAX_LISTED_MAPPINGS = 1000
+
+
+class SpatialGrid:
+    #Равномерная сетка: каждый объект лежит во всех ячейках, которые он задевает,
+    #поэтому для попадания курсора достаточно проверить одну ячейку
+    
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.item_cells = {}
+    
+    def cell_of(self, x, y):
+        return int(x // self.cell_size), int(y // self.cell_size)
+    
+    def insert_box(self, item, x1, y1, x2, y2):
+        cx1, cy1 = self.cell_of(x1, y1)
+        cx2, cy2 = self.cell_of(x2, y2)
+        self._store(item, [
+            (cx, cy) for cx in range(cx1, cx2 + 1) for cy in range(cy1, cy2 + 1)
+        ])
+    
+    def insert_segment(self, item, x1, y1, x2, y2, pad):
+        #Отрезок, расширенный на pad: идём по столбцам сетки
+        #и берём только ячейки вокруг части отрезка внутри столбца
+        size = self.cell_size
+        cells = []
+        cx_lo = int((min(x1, x2) - pad) // size)
+        cx_hi = int((max(x1, x2) + pad) // size)
+        for cx in range(cx_lo, cx_hi + 1):
+            if x1 == x2:
+                y_lo, y_hi = min(y1, y2), max(y1, y2)
+            else:
+                xa = max(cx * size - pad, min(x1, x2))
+                xb = min((cx + 1) * size + pad, max(x1, x2))
+                ya = y1 + (xa - x1) * (y2 - y1) / (x2 - x1)
+                yb = y1 + (xb - x1) * (y2 - y1) / (x2 - x1)
+                y_lo, y_hi = min(ya, yb), max(ya, yb)
+            for cy in range(int((y_lo - pad) // size), int((y_hi + pad) // size) + 1):
+                cells.append((cx, cy))
+        self._store(item, cells)
+    
+    def _store(self, item, cells):
+        self.remove(item)
+        self.item_cells[item] = cells
+        for cell in cells:
+            self.cells.setdefault(cell, set()).add(item)
+    
+    def remove(self, item):
+        for cell in self.item_cells.pop(item, ()):
+            bucket = self.cells[cell]
+            bucket.discard(item)
+            if not bucket:
+                del self.cells[cell]
+    
+    def query(self, x, y):
+        return self.cells.get(self.cell_of(x, y), ())
+    
+    def clear(self):
+        self.cells = {}
+        self.item_cells = {}
 
 
 class Point:
@@ -12,16 +84,19 @@ class Point:
         self.x = x
         self.y = y
         self.letter_id = letter_id
-        self.connections = []
+        self.index = None
         self.canvas_oval_id = None
         self.canvas_text_id = None
 
 
 class Edge:
     #Класс ребра графа
-    def __init__(self, point1_id, point2_id):
-        self.points = [point1_id, point2_id]
+    def __init__(self, point1, point2):
+        self.points = [point1, point2]
+        self.key = frozenset(self.points)
+        self.weight = 1
         self.canvas_line_id = None
+        self.canvas_label_id = None
 
 
 class GraphCanvas(tk.Canvas):
@@ -29,18 +104,30 @@ class GraphCanvas(tk.Canvas):
     
     def __init__(self, parent, **kwargs):
         super().__init__(parent, **kwargs)
-        self.points = {}
-        self.edges = []
+        # Данные вершин хранятся в массивах по индексу вершины (point.index)
+        self.points = []
+        self.incident = []
+        self.edges = {}
+        self.adjacency = BitAdjacency()
+        self.vertex_ids = []
         self.next_letter_idx = 0
         self.point_radius = 20
         self.edge_click_tolerance = 8
+        # Вызывается после каждой правки графа (окно обновляет инварианты)
+        self.on_change = None
+        
+        # Пространственные индексы для поиска вершины/ребра под курсором
+        self.point_grid = SpatialGrid(self.point_radius * 2)
+        self.edge_grid = SpatialGrid(self.point_radius * 2)
         
         # Для рисования рёбер
         self.edge_start_point = None
         self.temp_line = None
         
-        # Для перетаскивания вершин
+        # Для перетаскивания вершин: координаты копятся и применяются раз в кадр
         self.drag_point = None
+        self.drag_target = None
+        self.drag_job = None
         
         # Привязка событий мыши
         self.bind('<Button-1>', self.on_click)
@@ -48,9 +135,13 @@ class GraphCanvas(tk.Canvas):
         self.bind('<ButtonRelease-1>', self.on_release)
         self.bind('<Button-3>', self.on_right_click)
     
+    def notify_change(self):
+        if self.on_change:
+            self.on_change()
+    
     def get_point_at(self, x, y):
         #Находит вершину по координатам
-        for letter_id, point in self.points.items():
+        for point in self.point_grid.query(x, y):
             dist = ((point.x - x) ** 2 + (point.y - y) ** 2) ** 0.5
             if dist <= self.point_radius:
                 return point
@@ -58,14 +149,21 @@ class GraphCanvas(tk.Canvas):
     
     def get_edge_at(self, x, y):
         #Находит ребро по координатам
-        for edge in self.edges:
-            p1 = self.points[edge.points[0]]
-            p2 = self.points[edge.points[1]]
+        for edge in self.edge_grid.query(x, y):
+            p1, p2 = edge.points
             dist = self.point_to_segment_distance(x, y, p1.x, p1.y, p2.x, p2.y)
             if dist <= self.edge_click_tolerance:
                 return edge
         return None
     
+    def index_point(self, point):
+        r = self.point_radius
+        self.point_grid.insert_box(point, point.x - r, point.y - r, point.x + r, point.y + r)
+    
+    def index_edge(self, edge):
+        p1, p2 = edge.points
+        self.edge_grid.insert_segment(edge, p1.x, p1.y, p2.x, p2.y, self.edge_click_tolerance)
+    
     def point_to_segment_distance(self, px, py, x1, y1, x2, y2):
         #Вычисляет расстояние от точки до отрезка
         dx = x2 - x1
@@ -84,6 +182,12 @@ class GraphCanvas(tk.Canvas):
         #Обработка клика ЛКМ
         point = self.get_point_at(event.x, event.y)
         
+        if event.state & 0x4:  # Ctrl зажат — вес ребра под курсором
+            edge = self.get_edge_at(event.x, event.y)
+            if edge:
+                self.ask_edge_weight(edge)
+            return
+        
         if point:
             # Проверяем, зажат ли Shift
             if event.state & 0x1:  # Shift зажат
@@ -100,17 +204,33 @@ class GraphCanvas(tk.Canvas):
         #Обработка перетаскивания
         if self.drag_point:
             # Режим перетаскивания вершины
-            self.move_point_to(self.drag_point, event.x, event.y)
+            self.drag_target = (event.x, event.y)
+            if self.drag_job is None:
+                self.drag_job = self.after(DRAG_FRAME_MS, self.flush_drag)
         
         elif self.edge_start_point:
             # Режим рисования ребра — показываем пунктирную линию
             if self.temp_line:
-                self.delete(self.temp_line)
-            self.temp_line = self.create_line(
-                self.edge_start_point.x, self.edge_start_point.y,
-                event.x, event.y,
-                fill='gray', dash=(4, 4), width=2
-            )
+                self.coords(
+                    self.temp_line,
+                    self.edge_start_point.x, self.edge_start_point.y,
+                    event.x, event.y
+                )
+            else:
+                self.temp_line = self.create_line(
+                    self.edge_start_point.x, self.edge_start_point.y,
+                    event.x, event.y,
+                    fill='gray', dash=(4, 4), width=2
+                )
+    
+    def flush_drag(self):
+        #Применяет последнее положение перетаскиваемой вершины
+        if self.drag_job is not None:
+            self.after_cancel(self.drag_job)
+            self.drag_job = None
+        if self.drag_point and self.drag_target:
+            self.move_point_to(self.drag_point, *self.drag_target)
+        self.drag_target = None
     
     def on_release(self, event):
         #Обработка отпускания кнопки мыши
@@ -128,6 +248,7 @@ class GraphCanvas(tk.Canvas):
         
         # Если перетаскивали вершину
         if self.drag_point:
+            self.flush_drag()
             self.drag_point = None
     
     def move_point_to(self, point, x, y):
@@ -144,13 +265,14 @@ class GraphCanvas(tk.Canvas):
         
         # Перемещаем текст
         self.coords(point.canvas_text_id, point.x, point.y)
+        self.index_point(point)
         
         # Перерисовываем все связанные рёбра
-        for edge in self.edges:
-            if point.letter_id in edge.points:
-                p1 = self.points[edge.points[0]]
-                p2 = self.points[edge.points[1]]
-                self.coords(edge.canvas_line_id, p1.x, p1.y, p2.x, p2.y)
+        for edge in self.incident[point.index]:
+            p1, p2 = edge.points
+            self.coords(edge.canvas_line_id, p1.x, p1.y, p2.x, p2.y)
+            self.coords(edge.canvas_label_id, (p1.x + p2.x) / 2, (p1.y + p2.y) / 2)
+            self.index_edge(edge)
     
     def on_right_click(self, event):
         #ПКМ - удаление вершины или ребра
@@ -165,13 +287,19 @@ class GraphCanvas(tk.Canvas):
     
     def add_point(self, x, y):
         #Добавление новой вершины
-        if self.next_letter_idx >= len(LETTERS):
-            messagebox.showwarning("Предупреждение", "Достигнуто максимальное количество вершин")
-            return
-        
-        letter = LETTERS[self.next_letter_idx]
+        letter = vertex_name(self.next_letter_idx)
         self.next_letter_idx += 1
+        # Имена из загруженного графа могут совпасть со следующими по порядку
+        while letter in self.vertex_ids:
+            letter = vertex_name(self.next_letter_idx)
+            self.next_letter_idx += 1
         
+        self.draw_point(x, y, letter)
+        self.adjacency.add_vertex()
+        self.notify_change()
+    
+    def draw_point(self, x, y, letter):
+        #Элементы канваса и записи вершины, без матрицы смежности
         point = Point(x, y, letter)
         point.canvas_oval_id = self.create_oval(
             x - self.point_radius, y - self.point_radius,
@@ -179,200 +307,399 @@ class GraphCanvas(tk.Canvas):
             fill='lightblue', outline='darkblue', width=2
         )
         point.canvas_text_id = self.create_text(
-            x, y, text=letter, font=('Arial', 14, 'bold')
+            x, y, text=letter, font=('Arial', 14 if len(letter) == 1 else 11, 'bold')
         )
         
-        self.points[letter] = point
+        point.index = len(self.points)
+        self.vertex_ids.append(letter)
+        self.points.append(point)
+        self.incident.append(set())
+        self.index_point(point)
+        return point
     
     def delete_point(self, point):
         #Удаление вершины и всех связанных рёбер
-        edges_to_remove = [e for e in self.edges if point.letter_id in e.points]
-        for edge in edges_to_remove:
-            self.delete(edge.canvas_line_id)
-            self.edges.remove(edge)
-            other_id = edge.points[0] if edge.points[1] == point.letter_id else edge.points[1]
-            if other_id in self.points:
-                if point.letter_id in self.points[other_id].connections:
-                    self.points[other_id].connections.remove(point.letter_id)
+        if point is self.drag_point:
+            self.drag_point = None
+        # Ребро, которое тянули от этой вершины, уже не к чему присоединять
+        if point is self.edge_start_point:
+            self.edge_start_point = None
+            if self.temp_line:
+                self.delete(self.temp_line)
+                self.temp_line = None
+        for edge in list(self.incident[point.index]):
+            self.delete_edge(edge)
         
         self.delete(point.canvas_oval_id)
         self.delete(point.canvas_text_id)
-        del self.points[point.letter_id]
+        self.point_grid.remove(point)
+        
+        # Удаляем вершину из всех массивов и сдвигаем индексы следующих
+        idx = point.index
+        del self.points[idx]
+        del self.incident[idx]
+        del self.vertex_ids[idx]
+        self.adjacency.delete_vertex(idx)
+        for other in self.points[idx:]:
+            other.index -= 1
+        self.notify_change()
     
     def delete_edge(self, edge):
         #Удаление ребра
-        point1_id, point2_id = edge.points
+        point1, point2 = edge.points
         
         self.delete(edge.canvas_line_id)
-        self.edges.remove(edge)
+        self.delete(edge.canvas_label_id)
+        del self.edges[edge.key]
+        self.incident[point1.index].discard(edge)
+        self.incident[point2.index].discard(edge)
+        self.edge_grid.remove(edge)
         
-        if point1_id in self.points and point2_id in self.points[point1_id].connections:
-            self.points[point1_id].connections.remove(point2_id)
-        if point2_id in self.points and point1_id in self.points[point2_id].connections:
-            self.points[point2_id].connections.remove(point1_id)
+        self.adjacency.set_edge(point1.index, point2.index, False)
+        self.notify_change()
     
     def add_edge(self, point1, point2):
         #Добавление ребра между вершинами
-        for edge in self.edges:
-            if set(edge.points) == {point1.letter_id, point2.letter_id}:
-                return
+        if frozenset((point1, point2)) in self.edges:
+            return
         
-        edge = Edge(point1.letter_id, point2.letter_id)
+        self.draw_edge(point1, point2)
+        self.adjacency.set_edge(point1.index, point2.index, True)
+        self.notify_change()
+    
+    def draw_edge(self, point1, point2, weight=1):
+        #Линия, подпись веса и записи ребра, без матрицы смежности
+        edge = Edge(point1, point2)
+        edge.weight = weight
         edge.canvas_line_id = self.create_line(
             point1.x, point1.y, point2.x, point2.y,
             fill='black', width=3
         )
+        edge.canvas_label_id = self.create_text(
+            (point1.x + point2.x) / 2, (point1.y + point2.y) / 2,
+            text="" if weight == 1 else str(weight), font=('Arial', 11, 'bold'), fill='darkred'
+        )
         for p in [point1, point2]:
             self.tag_raise(p.canvas_oval_id)
             self.tag_raise(p.canvas_text_id)
         
-        self.edges.append(edge)
-        point1.connections.append(point2.letter_id)
-        point2.connections.append(point1.letter_id)
+        self.edges[edge.key] = edge
+        self.incident[point1.index].add(edge)
+        self.incident[point2.index].add(edge)
+        self.index_edge(edge)
+        return edge
+    
+    def ask_edge_weight(self, edge):
+        #Диалог ввода веса ребра
+        weight = simpledialog.askinteger(
+            "Вес ребра", "Вес ребра:", parent=self, minvalue=1, initialvalue=edge.weight
+        )
+        if weight is not None:
+            self.set_edge_weight(edge, weight)
+    
+    def set_edge_weight(self, edge, weight):
+        #Вес подписывается посередине ребра; вес 1 — без подписи
+        point1, point2 = edge.points
+        edge.weight = weight
+        self.itemconfig(edge.canvas_label_id, text="" if weight == 1 else str(weight))
+        self.adjacency.set_edge(point1.index, point2.index, weight)
+        self.notify_change()
+    
+    def load_graph(self, vertices, coords, adjacency):
+        #Загрузка целого графа за один проход: элементы канваса создаются подряд,
+        #а матрица смежности берётся готовой, без пересчёта на каждом ребре
+        self.clear_all()
+        points = [self.draw_point(x, y, name) for name, (x, y) in zip(vertices, coords)]
+        for i, row in enumerate(adjacency.to_matrix()):
+            for j in range(i + 1, len(row)):
+                if row[j]:
+                    self.draw_edge(points[i], points[j], row[j])
+        self.adjacency = adjacency.copy()
+        self.notify_change()
+    
+    def get_coords(self):
+        return [(point.x, point.y) for point in self.points]
+    
+    def get_adjacency(self):
+        #Возвращает копию битовой матрицы смежности и список вершин
+        return self.adjacency.copy(), list(self.vertex_ids)
     
     def get_adjacency_matrix(self):
         #Возвращает матрицу смежности и список вершин
-        vertices = sorted(self.points.keys())
-        n = len(vertices)
-        matrix = [[0] * n for _ in range(n)]
-        
-        for i, v1 in enumerate(vertices):
-            for j, v2 in enumerate(vertices):
-                if v2 in self.points[v1].connections:
-                    matrix[i][j] = 1
-        
-        return matrix, vertices
+        return self.adjacency.to_matrix(), list(self.vertex_ids)
     
     def clear_all(self):
         #Очистка канваса
         self.delete("all")
-        self.points = {}
-        self.edges = []
+        self.points = []
+        self.incident = []
+        self.edges = {}
+        self.point_grid.clear()
+        self.edge_grid.clear()
+        self.adjacency = BitAdjacency()
+        self.vertex_ids = []
         self.next_letter_idx = 0
+        self.notify_change()
 
 
 class AdjacencyMatrixTable(tk.Frame):
     #Таблица для ввода матрицы смежности
+    #Все ячейки нарисованы на одном канвасе: правка меняет только свои ячейки,
+    #а добавление вершины дорисовывает одну строку и один столбец
     
     def __init__(self, parent, **kwargs):
         super().__init__(parent, **kwargs)
-        self.matrix = []
-        self.buttons = []
+        self.adjacency = BitAdjacency()
         self.n = 0
-        self.build_table()
-    
-    def build_table(self):
-        for widget in self.winfo_children():
-            widget.destroy()
+        self.cell_width = 44
+        self.cell_height = 30
+        self.max_view_size = 520
+        self.on_change = None
         
-        self.buttons = []
+        # cells[i][j], row_headers[i], col_headers[j] — пары (прямоугольник, текст)
+        self.cells = []
+        self.row_headers = []
+        self.col_headers = []
         
-        tk.Label(self, text="", width=4, height=2).grid(row=0, column=0)
+        self.canvas = tk.Canvas(self, bg='#F0F0F0', highlightthickness=0, cursor='hand2')
+        x_scroll = tk.Scrollbar(self, orient='horizontal', command=self.canvas.xview)
+        y_scroll = tk.Scrollbar(self, orient='vertical', command=self.canvas.yview)
+        self.canvas.configure(xscrollcommand=x_scroll.set, yscrollcommand=y_scroll.set)
+        self.canvas.grid(row=0, column=0)
+        y_scroll.grid(row=0, column=1, sticky='ns')
+        x_scroll.grid(row=1, column=0, sticky='ew')
+        self.canvas.bind('<Button-1>', self.on_click)
+        self.canvas.bind('<Button-3>', self.on_right_click)
         
-        for j in range(self.n):
-            btn = tk.Button(
-                self, text=str(j + 1), width=4, height=1,
-                command=lambda c=j: self.delete_vertex(c),
-                bg='#FFE4B5', font=('Arial', 10, 'bold'),
-                cursor='hand2'
-            )
-            btn.grid(row=0, column=j + 1, padx=1, pady=1)
-        
-        tk.Button(
-            self, text="+", width=4, height=1,
-            command=self.add_vertex, bg='#90EE90',
-            font=('Arial', 10, 'bold'), cursor='hand2'
-        ).grid(row=0, column=self.n + 1, padx=1, pady=1)
-        
-        for i in range(self.n):
-            btn = tk.Button(
-                self, text=str(i + 1), width=4, height=1,
-                command=lambda r=i: self.delete_vertex(r),
-                bg='#FFE4B5', font=('Arial', 10, 'bold'),
-                cursor='hand2'
-            )
-            btn.grid(row=i + 1, column=0, padx=1, pady=1)
-            
-            row_buttons = []
-            for j in range(self.n):
-                if i == j:
-                    btn = tk.Button(
-                        self, text="—", width=4, height=1,
-                        state='disabled', bg='#D3D3D3',
-                        disabledforeground='#808080'
-                    )
-                else:
-                    val = self.matrix[i][j] if i < len(self.matrix) and j < len(self.matrix[i]) else 0
-                    bg = '#90EE90' if val == 1 else 'white'
-                    btn = tk.Button(
-                        self, text=str(val), width=4, height=1,
-                        command=lambda r=i, c=j: self.toggle_cell(r, c),
-                        bg=bg, font=('Arial', 10), cursor='hand2'
-                    )
-                btn.grid(row=i + 1, column=j + 1, padx=1, pady=1)
-                row_buttons.append(btn)
-            self.buttons.append(row_buttons)
+        self.build_table()
+    
+    def notify_change(self):
+        if self.on_change:
+            self.on_change()
+    
+    def draw_cell(self, row, col, text, bg, font=('Arial', 10), fg='black'):
+        x = col * self.cell_width
+        y = row * self.cell_height
+        rect = self.canvas.create_rectangle(
+            x + 1, y + 1, x + self.cell_width - 1, y + self.cell_height - 1,
+            fill=bg, outline='#A0A0A0'
+        )
+        text_id = self.canvas.create_text(
+            x + self.cell_width / 2, y + self.cell_height / 2,
+            text=text, font=font, fill=fg
+        )
+        return rect, text_id
+    
+    def place_cell(self, item, row, col):
+        rect, text_id = item
+        x = col * self.cell_width
+        y = row * self.cell_height
+        self.canvas.coords(rect, x + 1, y + 1, x + self.cell_width - 1, y + self.cell_height - 1)
+        self.canvas.coords(text_id, x + self.cell_width / 2, y + self.cell_height / 2)
+    
+    def delete_cell(self, item):
+        self.canvas.delete(*item)
+    
+    def draw_matrix_cell(self, i, j):
+        if i == j:
+            return self.draw_cell(i + 1, j + 1, "—", '#D3D3D3', fg='#808080')
+        val = self.adjacency.weight(i, j)
+        return self.draw_cell(i + 1, j + 1, str(val), '#90EE90' if val else 'white')
+    
+    def refresh_cell(self, i, j):
+        if i == j:
+            return
+        rect, text_id = self.cells[i][j]
+        val = self.adjacency.weight(i, j)
+        self.canvas.itemconfig(rect, fill='#90EE90' if val else 'white')
+        self.canvas.itemconfig(text_id, text=str(val))
+    
+    def draw_header(self, idx, is_row):
+        row, col = (idx + 1, 0) if is_row else (0, idx + 1)
+        return self.draw_cell(row, col, str(idx + 1), '#FFE4B5', font=('Arial', 10, 'bold'))
+    
+    def update_view(self):
+        #Кнопки «+» после последней строки/столбца и размеры области прокрутки
+        self.place_cell(self.add_col_button, 0, self.n + 1)
+        self.place_cell(self.add_row_button, self.n + 1, 0)
+        width = (self.n + 2) * self.cell_width
+        height = (self.n + 2) * self.cell_height
+        self.canvas.configure(
+            scrollregion=(0, 0, width, height),
+            width=min(width, self.max_view_size),
+            height=min(height, self.max_view_size)
+        )
+    
+    def build_table(self):
+        #Полная перерисовка — только при создании и очистке
+        self.canvas.delete('all')
+        plus_font = ('Arial', 10, 'bold')
+        self.add_col_button = self.draw_cell(0, self.n + 1, "+", '#90EE90', font=plus_font)
+        self.add_row_button = self.draw_cell(self.n + 1, 0, "+", '#90EE90', font=plus_font)
+        self.col_headers = [self.draw_header(j, False) for j in range(self.n)]
+        self.row_headers = [self.draw_header(i, True) for i in range(self.n)]
+        self.cells = [
+            [self.draw_matrix_cell(i, j) for j in range(self.n)]
+            for i in range(self.n)
+        ]
+        self.update_view()
+    
+    def on_click(self, event):
+        #Определяет ячейку под курсором и выполняет её действие
+        col = int(self.canvas.canvasx(event.x) // self.cell_width)
+        row = int(self.canvas.canvasy(event.y) // self.cell_height)
         
-        tk.Button(
-            self, text="+", width=4, height=1,
-            command=self.add_vertex, bg='#90EE90',
-            font=('Arial', 10, 'bold'), cursor='hand2'
-        ).grid(row=self.n + 1, column=0, padx=1, pady=1)
+        if (row, col) in ((0, self.n + 1), (self.n + 1, 0)):
+            self.add_vertex()
+        elif row == 0 and 1 <= col <= self.n:
+            self.delete_vertex(col - 1)
+        elif col == 0 and 1 <= row <= self.n:
+            self.delete_vertex(row - 1)
+        elif 1 <= row <= self.n and 1 <= col <= self.n:
+            self.toggle_cell(row - 1, col - 1)
+    
+    def on_right_click(self, event):
+        #ПКМ по ячейке — ввод веса ребра (0 — убрать ребро)
+        col = int(self.canvas.canvasx(event.x) // self.cell_width)
+        row = int(self.canvas.canvasy(event.y) // self.cell_height)
+        if not (1 <= row <= self.n and 1 <= col <= self.n) or row == col:
+            return
+        weight = simpledialog.askinteger(
+            "Вес ребра", f"Вес ребра {row}–{col}:", parent=self,
+            minvalue=0, initialvalue=self.adjacency.weight(row - 1, col - 1)
+        )
+        if weight is not None:
+            self.set_cell(row - 1, col - 1, weight)
     
     def add_vertex(self):
+        #Дорисовывает одну строку и один столбец — O(n) элементов канваса
+        self.adjacency.add_vertex()
         self.n += 1
-        for row in self.matrix:
-            row.append(0)
-        self.matrix.append([0] * self.n)
-        self.build_table()
+        k = self.n - 1
+        
+        self.col_headers.append(self.draw_header(k, False))
+        self.row_headers.append(self.draw_header(k, True))
+        for i in range(k):
+            self.cells[i].append(self.draw_matrix_cell(i, k))
+        self.cells.append([self.draw_matrix_cell(k, j) for j in range(self.n)])
+        self.update_view()
+        self.notify_change()
     
     def delete_vertex(self, idx):
+        #Удаляет последнюю строку и столбец, а сдвинутые значения перезаписывает
         if self.n <= 0:
             return
-        del self.matrix[idx]
-        for row in self.matrix:
-            del row[idx]
+        self.adjacency.delete_vertex(idx)
         self.n -= 1
-        self.build_table()
+        
+        self.delete_cell(self.col_headers.pop())
+        self.delete_cell(self.row_headers.pop())
+        for item in self.cells.pop():
+            self.delete_cell(item)
+        for row in self.cells:
+            self.delete_cell(row.pop())
+        
+        for i in range(self.n):
+            for j in range(idx if i < idx else 0, self.n):
+                self.refresh_cell(i, j)
+        self.update_view()
+        self.notify_change()
     
     def toggle_cell(self, i, j):
         if i == j:
             return
-        new_val = 1 - self.matrix[i][j]
-        self.matrix[i][j] = new_val
-        self.matrix[j][i] = new_val
-        bg = '#90EE90' if new_val == 1 else 'white'
-        self.buttons[i][j].config(text=str(new_val), bg=bg)
-        self.buttons[j][i].config(text=str(new_val), bg=bg)
+        self.set_cell(i, j, 1 - self.adjacency.has_edge(i, j))
+    
+    def set_cell(self, i, j, weight):
+        self.adjacency.set_edge(i, j, weight)
+        self.refresh_cell(i, j)
+        self.refresh_cell(j, i)
+        self.notify_change()
+    
+    def set_matrix(self, matrix):
+        #Вся матрица сразу: одна перерисовка вместо клика по каждой ячейке
+        self.adjacency = BitAdjacency.from_matrix(matrix)
+        self.n = len(self.adjacency)
+        self.build_table()
+        self.notify_change()
     
     def get_matrix(self):
-        return [row[:] for row in self.matrix]
+        return self.adjacency.to_matrix()
+    
+    def get_adjacency(self):
+        return self.adjacency.copy()
     
     def clear_all(self):
-        self.matrix = []
+        self.adjacency = BitAdjacency()
         self.n = 0
         self.build_table()
+        self.notify_change()
+
+
+def search_worker(graph_matrix, graph_vertices, user_matrix, control, results,
+                  parallel=False, cache=None, subgraph=False):
+    #Фоновый поиск для окна: сообщения складываются в очередь results,
+    #а окно забирает их через after(), не трогая Tk из этого потока
+    #('done',) ставится в очередь всегда, даже если поиск упал с ошибкой
+    try:
+        run_search(graph_matrix, graph_vertices, user_matrix, control, results, parallel, cache, subgraph)
+    except Exception as e:
+        results.put(('error', f"{type(e).__name__}: {e}"))
+    finally:
+        results.put(('done',))
+
 
+def library_worker(library, graph_matrix, control, results):
+    #Поиск по библиотеке в фоне: ('library', совпадения), затем ('done',)
+    try:
+        results.put(('library', library.find(graph_matrix, control)))
+    except Exception as e:
+        results.put(('error', f"{type(e).__name__}: {e}"))
+    finally:
+        results.put(('done',))
 
-def solve(graph_matrix, graph_vertices, user_matrix):
-    n = len(user_matrix)
-    if len(graph_vertices) != n:
-        return None, None
-    if n == 0:
-        return [], []
-    
-    for perm in permutations(range(n)):
-        permuted_matrix = [[0] * n for _ in range(n)]
-        for i in range(n):
-            for j in range(n):
-                permuted_matrix[i][j] = graph_matrix[perm[i]][perm[j]]
-        
-        if permuted_matrix == user_matrix:
-            numbers = list(range(1, n + 1))
-            letters = [graph_vertices[perm[i]] for i in range(n)]
-            return numbers, letters
-    
-    return None, None
+
+def run_search(graph_matrix, graph_vertices, user_matrix, control, results, parallel, cache, subgraph):
+    #Сам поиск: первое соответствие, группа и примеры соответствий
+    if subgraph:
+        # Первое вложение показывается сразу, остальные — не больше MAX_LISTED_MAPPINGS
+        listed = 0
+        for letters in iter_subgraph_isomorphisms(graph_matrix, graph_vertices, user_matrix, control):
+            results.put(('first' if listed == 0 else 'mapping', letters))
+            listed += 1
+            if listed >= MAX_LISTED_MAPPINGS:
+                break
+        if listed == 0:
+            results.put(('first', None))
+        else:
+            results.put(('embeddings', listed))
+        return
+    
+    mappings = iter_isomorphisms(graph_matrix, graph_vertices, user_matrix, control)
+    if parallel:
+        found = parallel_isomorphisms(graph_matrix, graph_vertices, user_matrix, control=control)
+        letters = found[0] if found else None
+    else:
+        letters = next(mappings, None)
+    first = letters
+    results.put(('first', letters))
+    
+    if letters is not None:
+        if cache is not None:
+            orbits, group_order = cache.group(graph_matrix, control)
+        else:
+            _, orbits, group_order = automorphism_group(graph_matrix, control)
+        results.put(('group', orbits, group_order))
+        
+        # Примеры соответствий — не больше MAX_LISTED_MAPPINGS
+        listed = 1
+        for letters in mappings:
+            if listed >= min(group_order, MAX_LISTED_MAPPINGS):
+                break
+            if letters == first:
+                continue
+            results.put(('mapping', letters))
+            listed += 1
 
 
 class GraphApp(tk.Tk):
@@ -381,15 +708,36 @@ class GraphApp(tk.Tk):
         self.title("Редактор графов — Изоморфизм")
         self.geometry("1100x750")
         self.configure(bg='#F0F0F0')
+        self.search_control = None
+        self.search_queue = None
+        self.search_vertices = None
+        self.first_letters = None
+        self.search_subgraph = False
+        self.poll_job = None
+        self.cache = IsomorphismCache()
+        self.library = None
         self.create_widgets()
     
     def create_widgets(self):
+        menu = tk.Menu(self)
+        file_menu = tk.Menu(menu, tearoff=0)
+        file_menu.add_command(label="Вставить матрицу из буфера", command=self.paste_matrix)
+        file_menu.add_command(label="Копировать матрицу в буфер", command=self.copy_matrix)
+        file_menu.add_separator()
+        file_menu.add_command(label="Открыть матрицу (CSV)…", command=self.import_matrix)
+        file_menu.add_command(label="Сохранить матрицу (CSV)…", command=self.export_matrix)
+        file_menu.add_separator()
+        file_menu.add_command(label="Открыть граф (JSON)…", command=self.import_graph)
+        file_menu.add_command(label="Сохранить граф (JSON)…", command=self.export_graph)
+        menu.add_cascade(label="Файл", menu=file_menu)
+        self.config(menu=menu)
+        
         top_frame = tk.Frame(self, bg='#F0F0F0')
         top_frame.pack(fill='both', expand=True, padx=10, pady=10)
         
         canvas_frame = tk.LabelFrame(
             top_frame, 
-            text="Граф: ЛКМ — точка/ребро | Shift+ЛКМ — перемещение | ПКМ — удалить",
+            text="Граф: ЛКМ — точка/ребро | Shift+ЛКМ — перемещение | Ctrl+ЛКМ — вес | ПКМ — удалить",
             font=('Arial', 10, 'bold'), bg='#F0F0F0'
         )
         canvas_frame.pack(side='left', fill='both', expand=True, padx=5)
@@ -397,14 +745,27 @@ class GraphApp(tk.Tk):
         self.canvas = GraphCanvas(canvas_frame, bg='white', width=500, height=450)
         self.canvas.pack(fill='both', expand=True, padx=5, pady=5)
         
+        canvas_buttons = tk.Frame(canvas_frame, bg='#F0F0F0')
+        canvas_buttons.pack(pady=5)
+        
         tk.Button(
-            canvas_frame, text="Очистить граф", command=self.canvas.clear_all,
+            canvas_buttons, text="Очистить граф", command=self.canvas.clear_all,
             bg='#FFB6C1', font=('Arial', 9)
-        ).pack(pady=5)
+        ).pack(side='left', padx=3)
+        
+        tk.Button(
+            canvas_buttons, text="Найти в библиотеке", command=self.find_in_library,
+            bg='#ADD8E6', font=('Arial', 9)
+        ).pack(side='left', padx=3)
+        
+        tk.Button(
+            canvas_buttons, text="Добавить в библиотеку", command=self.add_to_library,
+            bg='#ADD8E6', font=('Arial', 9)
+        ).pack(side='left', padx=3)
         
         table_frame = tk.LabelFrame(
             top_frame,
-            text="Матрица смежности (клик на номер — удалить)",
+            text="Матрица смежности (клик на номер — удалить, ПКМ — вес)",
             font=('Arial', 10, 'bold'), bg='#F0F0F0'
         )
         table_frame.pack(side='right', fill='both', padx=5)
@@ -420,11 +781,43 @@ class GraphApp(tk.Tk):
             bg='#FFB6C1', font=('Arial', 9)
         ).pack(pady=5)
         
+        buttons_frame = tk.Frame(self, bg='#F0F0F0')
+        buttons_frame.pack(pady=10)
+        
         tk.Button(
-            self, text="РЕШИТЬ", command=self.solve,
+            buttons_frame, text="РЕШИТЬ", command=self.solve,
             font=('Arial', 14, 'bold'), bg='#87CEEB',
             width=20, height=2, cursor='hand2'
-        ).pack(pady=10)
+        ).pack(side='left', padx=5)
+        
+        self.cancel_button = tk.Button(
+            buttons_frame, text="ОТМЕНА", command=self.cancel_search,
+            font=('Arial', 14, 'bold'), bg='#FFB6C1',
+            width=12, height=2, state='disabled'
+        )
+        self.cancel_button.pack(side='left', padx=5)
+        
+        self.parallel_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            buttons_frame, text="Параллельный поиск", variable=self.parallel_var,
+            font=('Arial', 10), bg='#F0F0F0'
+        ).pack(side='left', padx=5)
+        
+        self.subgraph_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            buttons_frame, text="Подграф (часть таблицы или лишние дороги)",
+            variable=self.subgraph_var, command=self.update_invariants,
+            font=('Arial', 10), bg='#F0F0F0'
+        ).pack(side='left', padx=5)
+        
+        # Инварианты пересчитываются на лету, поэтому несовпадение видно сразу
+        self.invariant_label = tk.Label(
+            self, text="", font=('Arial', 10), bg='#F0F0F0'
+        )
+        self.invariant_label.pack()
+        self.canvas.on_change = self.update_invariants
+        self.adj_table.on_change = self.update_invariants
+        self.update_invariants()
         
         self.result_frame = tk.LabelFrame(
             self, text="Результат", 
@@ -433,11 +826,12 @@ class GraphApp(tk.Tk):
         self.result_frame.pack(fill='x', padx=10, pady=10)
     
     def solve(self):
+        self.cancel_search()
         for widget in self.result_frame.winfo_children():
             widget.destroy()
         
-        graph_matrix, graph_vertices = self.canvas.get_adjacency_matrix()
-        user_matrix = self.adj_table.get_matrix()
+        graph_matrix, graph_vertices = self.canvas.get_adjacency()
+        user_matrix = self.adj_table.get_adjacency()
         
         if len(graph_vertices) == 0:
             messagebox.showwarning("Предупреждение", "Граф пуст!")
@@ -447,32 +841,151 @@ class GraphApp(tk.Tk):
             messagebox.showwarning("Предупреждение", "Матрица смежности пуста!")
             return
         
-        if len(graph_vertices) != len(user_matrix):
+        subgraph = self.subgraph_var.get()
+        if not subgraph and len(graph_vertices) != len(user_matrix):
             messagebox.showerror(
                 "Ошибка",
                 f"Вершин в графе: {len(graph_vertices)}, размер матрицы: {len(user_matrix)}"
             )
             return
         
-        numbers, letters = solve(graph_matrix, graph_vertices, user_matrix)
+        # Рисунок без весов сопоставляется с таблицей расстояний только по структуре
+        if graph_matrix.is_weighted != user_matrix.is_weighted:
+            graph_matrix = graph_matrix.unweighted()
+            user_matrix = user_matrix.unweighted()
+        
+        if subgraph:
+            reason = subgraph_mismatch(graph_matrix, user_matrix)
+            if reason:
+                messagebox.showerror("Ошибка", f"Меньший граф не вкладывается в больший: {reason}")
+                return
+        else:
+            reason = invariant_mismatch(graph_matrix, user_matrix)
+            if reason:
+                messagebox.showerror("Ошибка", f"Графы не могут быть изоморфны: {reason}")
+                return
+        
+        self.search_vertices = graph_vertices
+        self.search_subgraph = subgraph
+        self.start_worker(
+            search_worker, graph_matrix, graph_vertices, user_matrix,
+            parallel=self.parallel_var.get(), cache=self.cache, subgraph=subgraph
+        )
+    
+    def start_worker(self, worker, *args, **kwargs):
+        #Запускает worker(*args, control, results, **kwargs) в фоновом потоке,
+        #окно опрашивает очередь results через after()
+        self.progress_label = tk.Label(
+            self.result_frame, text="Поиск…",
+            font=('Arial', 10), fg='#505050', bg='#F0F0F0'
+        )
+        self.progress_label.pack()
         
-        if numbers is None:
+        self.search_control = SearchControl()
+        self.search_queue = queue.Queue()
+        threading.Thread(
+            target=worker,
+            args=(*args, self.search_control, self.search_queue),
+            kwargs=kwargs,
+            daemon=True
+        ).start()
+        self.cancel_button.config(state='normal')
+        self.poll_job = self.after(POLL_MS, self.poll_search)
+    
+    def update_invariants(self):
+        #Сравнивает инварианты графа и матрицы после каждой правки
+        graph = self.canvas.adjacency
+        user = self.adj_table.adjacency
+        if len(graph) == 0 or len(user) == 0:
+            self.invariant_label.config(text="", fg='black')
+            return
+        if self.subgraph_var.get():
+            reason = subgraph_mismatch(graph, user)
+            if reason:
+                self.invariant_label.config(text=f"Вложение невозможно: {reason}", fg='#B22222')
+            else:
+                self.invariant_label.config(text="Вложение не исключено инвариантами", fg='#228B22')
+            return
+        reason = invariant_mismatch(graph, user)
+        if reason:
+            self.invariant_label.config(text=f"Не могут быть изоморфны: {reason}", fg='#B22222')
+        else:
+            self.invariant_label.config(
+                text=f"Инварианты совпадают: вершин {len(graph)}, рёбер {graph.edge_count}, "
+                     f"треугольников {graph.triangles}",
+                fg='#228B22'
+            )
+    
+    def poll_search(self):
+        #Забирает сообщения фонового поиска и показывает прогресс
+        self.poll_job = None
+        finished = False
+        while True:
+            try:
+                message = self.search_queue.get_nowait()
+            except queue.Empty:
+                break
+            kind = message[0]
+            if kind == 'first':
+                self.show_first_mapping(message[1])
+            elif kind == 'group':
+                self.show_group(message[1], message[2])
+            elif kind == 'embeddings':
+                self.show_embeddings(message[1])
+            elif kind == 'mapping':
+                self.variants_list.insert('end', self.format_mapping(message[1]))
+            elif kind == 'library':
+                self.show_library_matches(message[1])
+            elif kind == 'error':
+                tk.Label(
+                    self.result_frame, text=f"❌ Ошибка поиска: {message[1]}",
+                    font=('Arial', 12, 'bold'), fg='red', bg='#F0F0F0', wraplength=1000
+                ).pack(pady=10)
+            elif kind == 'done':
+                finished = True
+        
+        nodes = self.search_control.nodes
+        if finished:
+            self.progress_label.config(text=f"Просмотрено узлов поиска: {nodes}")
+            self.search_control = None
+            self.cancel_button.config(state='disabled')
+        else:
+            self.progress_label.config(text=f"Поиск… просмотрено узлов: {nodes}")
+            self.poll_job = self.after(POLL_MS, self.poll_search)
+    
+    def cancel_search(self):
+        if self.poll_job is not None:
+            self.after_cancel(self.poll_job)
+            self.poll_job = None
+        if self.search_control is not None:
+            self.search_control.cancel()
+            self.search_control = None
+            self.progress_label.config(text="Поиск отменён")
+        self.cancel_button.config(state='disabled')
+    
+    def show_first_mapping(self, letters):
+        if letters is None:
             tk.Label(
                 self.result_frame,
-                text="❌ Соответствие не найдено. Графы не изоморфны.",
+                text="❌ Вложение не найдено." if self.search_subgraph
+                else "❌ Соответствие не найдено. Графы не изоморфны.",
                 font=('Arial', 12, 'bold'), fg='red', bg='#F0F0F0'
             ).pack(pady=10)
             return
         
+        self.first_letters = letters
+        
         tk.Label(
             self.result_frame,
-            text="✓ Найдено соответствие:",
+            text="✓ Найдено вложение:" if self.search_subgraph else "✓ Найдено соответствие:",
             font=('Arial', 12, 'bold'), fg='green', bg='#F0F0F0'
         ).pack(pady=5)
         
         result_table = tk.Frame(self.result_frame, bg='#F0F0F0')
         result_table.pack(pady=10)
         
+        numbers = list(range(1, len(letters) + 1))
+        
         tk.Label(
             result_table, text="Номер:", 
             font=('Arial', 11, 'bold'), bg='#F0F0F0', width=8
@@ -491,9 +1004,213 @@ class GraphApp(tk.Tk):
         
         for i, letter in enumerate(letters):
             tk.Label(
-                result_table, text=letter, width=4, height=2,
+                result_table, text=letter or "—", width=4, height=2,
                 relief='ridge', font=('Arial', 12, 'bold'), bg='#ADD8E6'
             ).grid(row=1, column=i + 1, padx=2, pady=2)
+        
+        self.orbits_label = tk.Label(
+            self.result_frame, text="Вычисляются орбиты…",
+            font=('Arial', 11), bg='#F0F0F0', wraplength=1000
+        )
+        self.orbits_label.pack()
+        self.count_label = tk.Label(self.result_frame, text="", font=('Arial', 10), bg='#F0F0F0')
+        self.count_label.pack()
+        
+        self.variants_list = tk.Listbox(self.result_frame, height=5, font=('Courier', 10))
+        self.variants_list.pack(fill='x', padx=10, pady=5)
+        self.variants_list.insert('end', self.format_mapping(letters))
+    
+    def show_group(self, orbits, group_order):
+        # Общее число соответствий равно порядку группы автоморфизмов графа,
+        # а взаимозаменяемые вершины — это её орбиты
+        self.orbits_label.config(text=self.format_orbits(orbits, self.search_vertices, self.first_letters))
+        self.count_label.config(text=f"Всего соответствий: {group_order}")
+    
+    def show_embeddings(self, listed):
+        # Вложения не связаны одной группой: показывается только их число
+        self.orbits_label.config(text="")
+        if listed >= MAX_LISTED_MAPPINGS:
+            self.count_label.config(text=f"Показаны первые {listed} вложений")
+        else:
+            self.count_label.config(text=f"Всего вложений: {listed}")
+    
+    def open_library(self, create=False):
+        #Библиотека эталонных графов открывается один раз за сеанс
+        if self.library is None:
+            ask = filedialog.asksaveasfilename if create else filedialog.askopenfilename
+            path = ask(
+                title="Файл библиотеки графов",
+                filetypes=[("JSON", "*.json")], defaultextension=".json"
+            )
+            if not path:
+                return None
+            self.library = GraphLibrary(path)
+        return self.library
+    
+    def find_in_library(self):
+        graph_matrix, graph_vertices = self.canvas.get_adjacency()
+        if len(graph_vertices) == 0:
+            messagebox.showwarning("Предупреждение", "Граф пуст!")
+            return
+        
+        library = self.open_library()
+        if library is None:
+            return
+        
+        self.cancel_search()
+        for widget in self.result_frame.winfo_children():
+            widget.destroy()
+        
+        self.search_vertices = graph_vertices
+        self.start_worker(library_worker, library, graph_matrix)
+    
+    def show_library_matches(self, matches):
+        if not matches:
+            tk.Label(
+                self.result_frame, text="❌ В библиотеке нет изоморфного графа.",
+                font=('Arial', 12, 'bold'), fg='red', bg='#F0F0F0'
+            ).pack(pady=10)
+            return
+        
+        tk.Label(
+            self.result_frame, text=f"✓ Совпадений в библиотеке: {len(matches)}",
+            font=('Arial', 12, 'bold'), fg='green', bg='#F0F0F0'
+        ).pack(pady=5)
+        for name, letters in matches:
+            pairs = '  '.join(f"{drawn}→{stored}" for drawn, stored in zip(self.search_vertices, letters))
+            tk.Label(
+                self.result_frame, text=f"{name}:  {pairs}",
+                font=('Arial', 10), bg='#F0F0F0', wraplength=1000
+            ).pack()
+    
+    def add_to_library(self):
+        graph_matrix, graph_vertices = self.canvas.get_adjacency()
+        if len(graph_vertices) == 0:
+            messagebox.showwarning("Предупреждение", "Граф пуст!")
+            return
+        
+        library = self.open_library(create=True)
+        if library is None:
+            return
+        name = simpledialog.askstring("Библиотека", "Название графа:", parent=self)
+        if not name:
+            return
+        library.add(name, graph_matrix, graph_vertices)
+        library.save()
+    
+    def load_matrix_text(self, text):
+        try:
+            matrix = parse_matrix_text(text)
+        except ValueError as e:
+            messagebox.showerror("Ошибка", f"Не удалось прочитать матрицу: {e}")
+            return
+        self.adj_table.set_matrix(matrix)
+    
+    def paste_matrix(self):
+        #Матрица из буфера обмена: строки таблицы через пробел, табуляцию или ;
+        try:
+            text = self.clipboard_get()
+        except tk.TclError:
+            messagebox.showwarning("Предупреждение", "Буфер обмена пуст!")
+            return
+        self.load_matrix_text(text)
+    
+    def copy_matrix(self):
+        # Через табуляцию — так таблица вставляется в Excel по ячейкам
+        self.clipboard_clear()
+        self.clipboard_append(format_matrix_text(self.adj_table.get_matrix(), '\t'))
+    
+    def import_matrix(self):
+        path = filedialog.askopenfilename(
+            title="Матрица смежности",
+            filetypes=[("CSV", "*.csv"), ("Текст", "*.txt"), ("Все файлы", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            # Русский Excel сохраняет CSV в cp1251
+            try:
+                text = data.decode('utf-8-sig')
+            except UnicodeDecodeError:
+                text = data.decode('cp1251')
+        except (OSError, UnicodeDecodeError) as e:
+            messagebox.showerror("Ошибка", f"Не удалось прочитать файл: {e}")
+            return
+        self.load_matrix_text(text)
+    
+    def export_matrix(self):
+        path = filedialog.asksaveasfilename(
+            title="Матрица смежности",
+            filetypes=[("CSV", "*.csv")], defaultextension=".csv"
+        )
+        if not path:
+            return
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(format_matrix_text(self.adj_table.get_matrix()))
+    
+    def import_graph(self):
+        #Граф из JSON: {"vertices", "edges", "coords"} или просто матрица;
+        #без координат вершины расставляются по окружности
+        path = filedialog.askopenfilename(title="Граф", filetypes=[("JSON", "*.json")])
+        if not path:
+            return
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            adjacency, vertices = parse_graph(data)
+            coords = data.get("coords") if isinstance(data, dict) else None
+            if coords is not None and not (isinstance(coords, list) and all(
+                isinstance(xy, list) and len(xy) == 2 and all(
+                    isinstance(c, (int, float)) and not isinstance(c, bool) and math.isfinite(c) for c in xy
+                ) for xy in coords
+            )):
+                raise ValueError("координаты вершин должны быть парами чисел")
+        except (ValueError, KeyError, TypeError, IndexError) as e:
+            messagebox.showerror("Ошибка", f"Не удалось прочитать граф: {e}")
+            return
+        
+        if coords is None or len(coords) != len(vertices):
+            coords = self.circle_layout(len(vertices))
+        self.canvas.load_graph(vertices, coords, adjacency)
+    
+    def export_graph(self):
+        graph_matrix, graph_vertices = self.canvas.get_adjacency()
+        path = filedialog.asksaveasfilename(
+            title="Граф", filetypes=[("JSON", "*.json")], defaultextension=".json"
+        )
+        if not path:
+            return
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(graph_to_data(graph_matrix, graph_vertices, self.canvas.get_coords()), f, ensure_ascii=False)
+    
+    def circle_layout(self, n):
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height()
+        radius = min(width, height) / 2 - self.canvas.point_radius * 2
+        return [
+            (width / 2 + radius * math.cos(2 * math.pi * k / n - math.pi / 2),
+             height / 2 + radius * math.sin(2 * math.pi * k / n - math.pi / 2))
+            for k in range(n)
+        ]
+    
+    def format_orbits(self, orbits, graph_vertices, letters):
+        number_of = {letter: i + 1 for i, letter in enumerate(letters)}
+        parts = []
+        for orbit in orbits:
+            orbit_letters = [graph_vertices[g] for g in orbit]
+            orbit_numbers = sorted(number_of[letter] for letter in orbit_letters)
+            if len(orbit) == 1:
+                parts.append(f"{orbit_letters[0]}↔{orbit_numbers[0]} однозначно")
+            else:
+                parts.append(
+                    "{" + ",".join(orbit_letters) + "}↔{" + ",".join(map(str, orbit_numbers)) + "}"
+                )
+        return ", ".join(parts)
+    
+    def format_mapping(self, letters):
+        return '  '.join(f"{i + 1}→{letter or '—'}" for i, letter in enumerate(letters))
 
 
 if __name__ == '__main__':
@@ -1,81 +1,10 @@
 import sys
+
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QTableWidget, QTableWidgetItem, QComboBox, QMessageBox, QHeaderView)
 from PySide6.QtGui import QPainter, QPen, QColor, QBrush, QFont
 from PySide6.QtCore import Qt, QRectF
 
-
-class Interval:
-    def __init__(self, name, start, end):
-        self.name = name
-        self.start = float(start)
-        self.end = float(end)
-
-    def __contains__(self, item):
-        return self.start <= item <= self.end
-
-    def __repr__(self):
-        return f"{self.name}: [{self.start:.2f}, {self.end:.2f}]"
-
-
-class LogicSolver:
-    def __init__(self, expression, intervals, search_range=(0, 100), step=0.5):
-        self.expression = expression
-        self.intervals = {i.name: i for i in intervals} 
-        self.search_range = search_range
-        self.step = step
-
-    def check_expression(self, x, a_val_bool):
-        context = {}
-        for name, interval in self.intervals.items():
-            context[name] = interval
-        if a_val_bool:
-            context['A'] = [x]
-        else:
-            context['A'] = []
-        
-        context['x'] = x
-
-        try:
-            return bool(eval(self.expression, {}, context))
-        except Exception as e:
-            raise ValueError(f"Ошибка в формуле: {e}")
-
-    def solve(self, mode="min", target_value=True):
-        current = self.search_range[0]
-        segments = []
-        current_segment_start = None
-        
-        while current <= self.search_range[1]:
-            res_without_a = self.check_expression(current, False)
-            res_with_a = self.check_expression(current, True)
-            
-            condition_met = False
-            if mode == "min":
-                condition_met = (res_without_a != target_value)
-            elif mode == "max":
-                condition_met = (res_with_a == target_value)
-            
-            if condition_met:
-                if current_segment_start is None:
-                    current_segment_start = current
-            else:
-                if current_segment_start is not None:
-                    segments.append((current_segment_start, current - self.step))
-                    current_segment_start = None
-            
-            current += self.step
-            current = round(current, 2)
-        
-        if current_segment_start is not None:
-            segments.append((current_segment_start, min(current - self.step, self.search_range[1])))
-        
-        if not segments:
-            return None
-        
-        if mode == "min":
-            return Interval("A (Result)", segments[0][0], segments[0][1])
-        elif mode == "max":
-            return Interval("A (Result)", segments[-1][0], segments[-1][1])
+from logic_solver import Interval, LogicSolver, search_range_for
 
 
 class IntervalChart(QWidget):
@@ -151,7 +80,7 @@ class IntervalChart(QWidget):
             
             # Текст
             if is_result:
-                coord_text = f"[{interval.start:.1f}, {interval.end:.1f}]"
+                coord_text = interval.bounds_text(1)
                 painter.setPen(QPen(Qt.GlobalColor.black, 1))
                 painter.setFont(QFont("Arial", 9, QFont.Weight.Bold))
                 text_width = painter.fontMetrics().horizontalAdvance(coord_text)
@@ -413,10 +342,7 @@ class MainWindow(QMainWindow):
         target_is_true = (self.target_combo.currentIndex() == 0)
 
         try:
-            all_coords = [i.end for i in intervals]
-            max_search = max(all_coords) * 1.5 if all_coords else 100
-            
-            solver = LogicSolver(formula, intervals, search_range=(0, max_search))
+            solver = LogicSolver(formula, intervals, search_range=search_range_for(intervals))
             result_a = solver.solve(mode=mode, target_value=target_is_true)
             
             self.chart.update_data(intervals, result_a)
@@ -427,7 +353,7 @@ class MainWindow(QMainWindow):
             if result_a:
                 length = result_a.end - result_a.start
                 self.result_label.setText(
-                    f"Отрезок A: [{result_a.start:.2f}, {result_a.end:.2f}] "
+                    f"Отрезок A: {result_a.bounds_text()} "
                     f"(длина: {length:.2f})"
                 )
                 self.result_label.setStyleSheet("color: green; font-weight: bold;")
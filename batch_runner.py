@@ -0,0 +1,52 @@
+#Общий пакетный режим graph_solver.py и logic_solver.py: строки входа решаются
+#в пуле процессов, результаты построчно в stdout (JSON), скорость — в stderr
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+
+def read_lines(path):
+    #Непустые строки файла без комментариев; '-' — stdin
+    stream = sys.stdin if path == '-' else open(path, encoding='utf-8')
+    with stream:
+        for line in stream:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                yield line
+
+
+def batches(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def run_batch(path, workers, solve_line, extra_args=(), initializer=None, initargs=(),
+              on_result=None, unit="строк"):
+    #solve_line(line, *extra_args) выполняется в процессах пула и возвращает то,
+    #что после on_result (если задан) печатается как JSON; возвращает число строк
+    solved = 0
+    start = time.perf_counter()
+    
+    with ProcessPoolExecutor(workers, initializer=initializer, initargs=initargs) as pool:
+        # Вход читается порциями, чтобы не держать весь файл в памяти
+        for batch in batches(read_lines(path), workers * 64):
+            chunksize = max(1, len(batch) // (workers * 4))
+            columns = [[arg] * len(batch) for arg in extra_args]
+            for result in pool.map(solve_line, batch, *columns, chunksize=chunksize):
+                if on_result is not None:
+                    result = on_result(result)
+                print(json.dumps(result, ensure_ascii=False))
+                solved += 1
+            sys.stdout.flush()
+    
+    elapsed = time.perf_counter() - start
+    rate = solved / elapsed if elapsed > 0 else 0.0
+    print(f"{solved} {unit} за {elapsed:.2f} с ({rate:.1f} {unit}/с)", file=sys.stderr)
+    return solved
@@ -0,0 +1,1206 @@
+#Поиск изоморфизма графов без tkinter: используется окном 1.py и пакетным режимом
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from batch_runner import run_batch
+
+
+LETTERS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+SHARD_WAIT_S = 0.05
+
+
+def vertex_name(idx):
+    #Имя вершины по номеру: A..Z, затем AA, AB, ... как столбцы в таблицах
+    name = ''
+    idx += 1
+    while idx:
+        idx, rem = divmod(idx - 1, len(LETTERS))
+        name = LETTERS[rem] + name
+    return name
+
+
+def _count(counter, key, delta):
+    #Изменяет счётчик гистограммы и убирает обнулившиеся ключи
+    counter[key] += delta
+    if not counter[key]:
+        del counter[key]
+
+
+class BitAdjacency:
+    #Матрица смежности: строка вершины — целое число, бит j означает ребро с вершиной j
+    #weights[i] — веса рёбер вершины i, отличные от 1 (вес по умолчанию не хранится)
+    #Попутно поддерживает инварианты: число рёбер и треугольников,
+    #гистограммы степеней (степень -> число вершин) и весов рёбер (вес -> число рёбер)
+    
+    def __init__(self, n=0):
+        self.rows = [0] * n
+        self.weights = [{} for _ in range(n)]
+        self.edge_count = 0
+        self.triangles = 0
+        self.degree_counts = Counter({0: n}) if n else Counter()
+        self.weight_counts = Counter()
+    
+    def __len__(self):
+        return len(self.rows)
+    
+    @classmethod
+    def from_matrix(cls, matrix):
+        #Ненулевое значение — ребро, значение кроме 1 — его вес
+        return cls.from_rows(
+            (sum(1 << j for j, val in enumerate(row) if val) for row in matrix),
+            [{j: val for j, val in enumerate(row) if val and val != 1} for row in matrix]
+        )
+    
+    @classmethod
+    def from_rows(cls, rows, weights=None):
+        adjacency = cls()
+        adjacency.rows = list(rows)
+        if weights is not None:
+            adjacency.weights = [dict(row_weights) for row_weights in weights]
+        else:
+            adjacency.weights = [{} for _ in adjacency.rows]
+        adjacency.recount()
+        return adjacency
+    
+    def recount(self):
+        #Полный пересчёт инвариантов — только при создании из готовых строк
+        rows = self.rows
+        self.degree_counts = Counter(row.bit_count() for row in rows)
+        self.edge_count = sum(row.bit_count() for row in rows) // 2
+        self.triangles = 0
+        self.weight_counts = Counter()
+        for i, row in enumerate(rows):
+            for j in _bits(row):
+                if i < j:
+                    self.triangles += (rows[i] & rows[j]).bit_count()
+                    self.weight_counts[self.weight(i, j)] += 1
+        self.triangles //= 3
+    
+    def copy(self):
+        adjacency = BitAdjacency()
+        adjacency.rows = self.rows[:]
+        adjacency.weights = [dict(row_weights) for row_weights in self.weights]
+        adjacency.edge_count = self.edge_count
+        adjacency.triangles = self.triangles
+        adjacency.degree_counts = self.degree_counts.copy()
+        adjacency.weight_counts = self.weight_counts.copy()
+        return adjacency
+    
+    def unweighted(self):
+        #Копия без весов: все рёбра с весом 1
+        return BitAdjacency.from_rows(self.rows)
+    
+    @property
+    def is_weighted(self):
+        return any(self.weights)
+    
+    def _shift_degree(self, i, delta):
+        degree = self.rows[i].bit_count()
+        _count(self.degree_counts, degree, -1)
+        self.degree_counts[degree + delta] += 1
+    
+    def add_vertex(self):
+        self.rows.append(0)
+        self.weights.append({})
+        self.degree_counts[0] += 1
+        return len(self.rows) - 1
+    
+    def delete_vertex(self, idx):
+        #Удаляет строку и сдвигает старшие биты остальных строк на место idx
+        row = self.rows[idx]
+        degree = row.bit_count()
+        # Каждый треугольник с вершиной idx виден с двух её соседей
+        self.triangles -= sum((self.rows[w] & row).bit_count() for w in _bits(row)) // 2
+        for w in _bits(row):
+            self._shift_degree(w, -1)
+            _count(self.weight_counts, self.weight(idx, w), -1)
+        self.edge_count -= degree
+        _count(self.degree_counts, degree, -1)
+        
+        del self.rows[idx]
+        low_mask = (1 << idx) - 1
+        self.rows = [(row & low_mask) | ((row >> (idx + 1)) << idx) for row in self.rows]
+        del self.weights[idx]
+        self.weights = [
+            {j - (j > idx): weight for j, weight in row_weights.items() if j != idx}
+            if row_weights else row_weights
+            for row_weights in self.weights
+        ]
+    
+    def has_edge(self, i, j):
+        return self.rows[i] >> j & 1
+    
+    def weight(self, i, j):
+        #Вес ребра или 0, если ребра нет
+        if not self.rows[i] >> j & 1:
+            return 0
+        return self.weights[i].get(j, 1)
+    
+    def set_edge(self, i, j, value):
+        #value — вес ребра (True — вес 1), 0 или False убирает ребро
+        old = self.weight(i, j)
+        if old == value:
+            return
+        if old:
+            _count(self.weight_counts, old, -1)
+        if value and value != 1:
+            self.weights[i][j] = self.weights[j][i] = value
+        else:
+            self.weights[i].pop(j, None)
+            self.weights[j].pop(i, None)
+        if value:
+            self.weight_counts[1 if value is True else value] += 1
+        if bool(old) == bool(value):
+            return
+        
+        delta = 1 if value else -1
+        self._shift_degree(i, delta)
+        self._shift_degree(j, delta)
+        self.edge_count += delta
+        if value:
+            self.triangles += (self.rows[i] & self.rows[j]).bit_count()
+            self.rows[i] |= 1 << j
+            self.rows[j] |= 1 << i
+        else:
+            self.rows[i] &= ~(1 << j)
+            self.rows[j] &= ~(1 << i)
+            self.triangles -= (self.rows[i] & self.rows[j]).bit_count()
+    
+    def degree(self, i):
+        return self.rows[i].bit_count()
+    
+    def to_matrix(self):
+        #Матрица весов: 0 — нет ребра, у невзвешенного графа — матрица из 0 и 1
+        n = len(self.rows)
+        return [
+            [self.weights[i].get(j, 1) if row >> j & 1 else 0 for j in range(n)]
+            for i, row in enumerate(self.rows)
+        ]
+
+
+def invariant_mismatch(graph, user):
+    #Причина, по которой графы заведомо не изоморфны, или None
+    #Сравниваются только поддерживаемые на лету инварианты BitAdjacency;
+    #веса — только если они заданы у обоих графов
+    if len(graph) != len(user):
+        return f"вершин {len(graph)} и {len(user)}"
+    if graph.edge_count != user.edge_count:
+        return f"рёбер {graph.edge_count} и {user.edge_count}"
+    if graph.degree_counts != user.degree_counts:
+        return "разные наборы степеней вершин"
+    if graph.triangles != user.triangles:
+        return f"треугольников {graph.triangles} и {user.triangles}"
+    if graph.is_weighted and user.is_weighted and graph.weight_counts != user.weight_counts:
+        return "разные наборы весов рёбер"
+    return None
+
+
+def _pattern_first(graph, user):
+    #Какой из графов меньше и ищется внутри другого: True — матрица внутри рисунка
+    return len(user) <= len(graph) and user.edge_count <= graph.edge_count
+
+
+def _degree_sequence(adjacency):
+    return sorted(adjacency.degree_counts.elements(), reverse=True)
+
+
+def subgraph_mismatch(graph, user):
+    #Причина, по которой меньший граф заведомо не вкладывается в больший, или None
+    #Вложение не уменьшает ни одну из величин: вершины, рёбра, треугольники,
+    #k-я по величине степень и число рёбер каждого веса
+    pattern, target = (user, graph) if _pattern_first(graph, user) else (graph, user)
+    if len(pattern) > len(target):
+        return f"вершин {len(pattern)} больше, чем {len(target)}"
+    if pattern.edge_count > target.edge_count:
+        return f"рёбер {pattern.edge_count} больше, чем {target.edge_count}"
+    if pattern.triangles > target.triangles:
+        return f"треугольников {pattern.triangles} больше, чем {target.triangles}"
+    if any(p > t for p, t in zip(_degree_sequence(pattern), _degree_sequence(target))):
+        return "степени меньшего графа не помещаются в больший"
+    if pattern.is_weighted and target.is_weighted and not pattern.weight_counts <= target.weight_counts:
+        return "не хватает рёбер нужного веса"
+    return None
+
+
+class SearchControl:
+    #Связь с фоновым поиском: счётчик просмотренных узлов и флаг отмены
+    
+    def __init__(self, cancel_event=None):
+        self.nodes = 0
+        self.cancel_event = cancel_event if cancel_event is not None else threading.Event()
+    
+    def cancel(self):
+        self.cancel_event.set()
+    
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+
+def _bits(mask):
+    #Номера установленных битов маски
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def _adjacency_of(graph):
+    return graph if isinstance(graph, BitAdjacency) else BitAdjacency.from_matrix(graph)
+
+
+def _rows_of(graph):
+    #Строки смежности в виде битовых масок из BitAdjacency или обычной матрицы
+    if isinstance(graph, BitAdjacency):
+        return graph.rows
+    return BitAdjacency.from_matrix(graph).rows
+
+
+def _weights_of(graph):
+    #Веса рёбер по строкам или None, если у всех рёбер вес 1
+    if not isinstance(graph, BitAdjacency):
+        graph = BitAdjacency.from_matrix(graph)
+    return graph.weights if graph.is_weighted else None
+
+
+def _weight_pair(graph_matrix, user_matrix):
+    #Веса обоих графов для поиска; None — если оба графа невзвешенные
+    graph_weights = _weights_of(graph_matrix)
+    user_weights = _weights_of(user_matrix)
+    if graph_weights is None and user_weights is None:
+        return None
+    return (
+        graph_weights or [{}] * len(_rows_of(graph_matrix)),
+        user_weights or [{}] * len(_rows_of(user_matrix)),
+    )
+
+
+def _weight_signature(row, row_weights):
+    #Набор весов рёбер вершины (с учётом рёбер веса 1)
+    return tuple(sorted(row_weights.get(w, 1) for w in _bits(row)))
+
+
+def _refine_colours(graph_rows, user_rows, initial=None, trace=None, weights=None):
+    #Уточнение раскраски (Вейсфейлер–Леман) сразу для обоих графов
+    #initial — необязательные начальные цвета вершин обоих графов (для индивидуализации)
+    #trace — список, куда дописываются палитра и гистограмма каждого раунда
+    #weights — веса рёбер обоих графов: начальный цвет включает набор весов вершины,
+    #а соседи различаются ещё и по весу ведущего к ним ребра
+    #Возвращает цвета вершин обоих графов или None, если гистограммы цветов различны
+    both_rows = (graph_rows, user_rows)
+    if initial is None:
+        initial = [[0] * len(rows) for rows in both_rows]
+    colours = [
+        [(init[v], row.bit_count()) for v, row in enumerate(rows)]
+        for init, rows in zip(initial, both_rows)
+    ]
+    if weights is not None:
+        colours = [
+            [col + (_weight_signature(row, row_weights),) for col, row, row_weights in zip(cols, rows, wts)]
+            for cols, rows, wts in zip(colours, both_rows, weights)
+        ]
+    classes = 0
+    
+    while True:
+        signatures = []
+        for side, (cols, rows) in enumerate(zip(colours, both_rows)):
+            # Сколько соседей вершины в каждом цвете: один проход по её соседям,
+            # так что раунд стоит O(n + m), а не O(n · число классов)
+            sigs = []
+            for v, row in enumerate(rows):
+                counts = {}
+                for w in _bits(row):
+                    counts[cols[w]] = counts.get(cols[w], 0) + 1
+                sigs.append((cols[v], tuple(sorted(counts.items()))))
+            if weights is not None:
+                # Рёбра веса 1 уже учтены счётчиками выше, достаточно остальных
+                sigs = [
+                    sig + (tuple(sorted((cols[w], weight) for w, weight in row_weights.items())),)
+                    for sig, row_weights in zip(sigs, weights[side])
+                ]
+            signatures.append(sigs)
+        # Общая палитра, чтобы номера цветов совпадали в обоих графах
+        palette = {sig: idx for idx, sig in enumerate(sorted(set(signatures[0]) | set(signatures[1])))}
+        colours = [[palette[sig] for sig in sigs] for sigs in signatures]
+        if trace is not None:
+            trace.append((tuple(palette), tuple(sorted(colours[0]))))
+        if sorted(colours[0]) != sorted(colours[1]):
+            return None
+        if len(palette) == classes:
+            return colours
+        classes = len(palette)
+
+
+def _search_order(rows, colours):
+    #Порядок обхода: следующая вершина — самая связанная с уже выбранными,
+    #при равенстве — из самого маленького класса цвета
+    n = len(rows)
+    class_size = {}
+    for c in colours:
+        class_size[c] = class_size.get(c, 0) + 1
+    chosen = 0
+    order = []
+    
+    for _ in range(n):
+        best = max(
+            (v for v in range(n) if not chosen >> v & 1),
+            key=lambda v: ((rows[v] & chosen).bit_count(), -class_size[colours[v]], rows[v].bit_count())
+        )
+        chosen |= 1 << best
+        order.append(best)
+    
+    return order
+
+
+def _prepare_search(graph_rows, user_rows, initial=None, weights=None):
+    #Кандидаты для каждой вершины матрицы (битовая маска вершин графа) и порядок обхода
+    #None — если раскраска уже показывает, что графы не изоморфны
+    refined = _refine_colours(graph_rows, user_rows, initial, weights=weights)
+    if refined is None:
+        return None
+    graph_colours, user_colours = refined
+    
+    # Кандидаты берутся только из того же класса цвета
+    class_masks = {}
+    for g, c in enumerate(graph_colours):
+        class_masks[c] = class_masks.get(c, 0) | (1 << g)
+    candidates = [class_masks[c] for c in user_colours]
+    
+    return candidates, _search_order(user_rows, user_colours)
+
+
+def _iter_mappings(graph_rows, user_rows, initial=None, control=None, weights=None):
+    #Поиск с возвратом: вершины матрицы сопоставляются вершинам графа по одной
+    #Лениво выдаёт все соответствия: mapping[номер - 1] = индекс вершины графа
+    #control (SearchControl) считает узлы и позволяет прервать поиск
+    #weights — веса рёбер обоих графов: образы рёбер должны иметь тот же вес
+    n = len(user_rows)
+    prepared = _prepare_search(graph_rows, user_rows, initial, weights)
+    if prepared is None:
+        return
+    candidates, order = prepared
+    mapping = [None] * n
+    graph_weights, user_weights = weights if weights is not None else (None, None)
+    
+    def extend(depth, user_mapped, graph_mapped):
+        if control is not None:
+            control.nodes += 1
+            if control.cancelled:
+                return
+        if depth == n:
+            yield list(mapping)
+            return
+        u = order[depth]
+        # Образ уже сопоставленных соседей u: у кандидата среди
+        # сопоставленных вершин должны быть соседями ровно они
+        # Кандидаты — свободные вершины класса, смежные с образами всех этих соседей
+        neighbours = list(_bits(user_rows[u] & user_mapped))
+        want = 0
+        allowed = candidates[u] & ~graph_mapped
+        for w in neighbours:
+            want |= 1 << mapping[w]
+            allowed &= graph_rows[mapping[w]]
+        for g in _bits(allowed):
+            if graph_rows[g] & graph_mapped != want:
+                continue
+            if weights is not None and any(
+                graph_weights[g].get(mapping[w], 1) != user_weights[u].get(w, 1) for w in neighbours
+            ):
+                continue
+            mapping[u] = g
+            yield from extend(depth + 1, user_mapped | (1 << u), graph_mapped | (1 << g))
+        mapping[u] = None
+    
+    yield from extend(0, 0, 0)
+
+
+def _orbit_of(v, generators):
+    #Орбита вершины под действием группы, порождённой перестановками generators
+    orbit = {v}
+    frontier = [v]
+    while frontier:
+        w = frontier.pop()
+        for perm in generators:
+            if perm[w] not in orbit:
+                orbit.add(perm[w])
+                frontier.append(perm[w])
+    return orbit
+
+
+def automorphism_group(matrix, control=None):
+    #Группа автоморфизмов графа через цепочку стабилизаторов:
+    #вершины по очереди фиксируются, и для каждой ищутся автоморфизмы,
+    #переводящие её в остальные вершины её класса цвета
+    #Принимает BitAdjacency или обычную матрицу; веса рёбер автоморфизм сохраняет
+    #Возвращает (образующие, орбиты, порядок группы)
+    rows = _rows_of(matrix)
+    weights = _weight_pair(matrix, matrix)
+    n = len(rows)
+    generators = []
+    group_order = 1
+    initial = [0] * n
+    fixed = []
+    
+    while control is None or not control.cancelled:
+        colours = _refine_colours(rows, rows, (initial, initial), weights=weights)[0]
+        cells = {}
+        for v, c in enumerate(colours):
+            cells.setdefault(c, []).append(v)
+        cell = min((c for c in cells.values() if len(c) > 1), key=len, default=None)
+        if cell is None:
+            break
+        
+        v = cell[0]
+        label = len(fixed) + 1
+        stabilizer = [perm for perm in generators if all(perm[p] == p for p in fixed)]
+        orbit = _orbit_of(v, stabilizer)
+        for u in cell:
+            if u in orbit:
+                continue
+            # Автоморфизм, фиксирующий уже выбранные вершины и переводящий v в u
+            source = initial[:]
+            target = initial[:]
+            source[v] = label
+            target[u] = label
+            perm = next(_iter_mappings(rows, rows, (target, source), control, weights), None)
+            if perm is not None:
+                generators.append(perm)
+                stabilizer.append(perm)
+                orbit = _orbit_of(v, stabilizer)
+        
+        group_order *= len(orbit)
+        initial[v] = label
+        fixed.append(v)
+    
+    orbits = []
+    seen = set()
+    for v in range(n):
+        if v not in seen:
+            orbit = _orbit_of(v, generators)
+            seen |= orbit
+            orbits.append(sorted(orbit))
+    
+    return generators, orbits, group_order
+
+
+def iter_isomorphisms(graph_matrix, graph_vertices, user_matrix, control=None):
+    #Генератор всех соответствий: для каждого выдаёт список букв по номерам 1..n
+    #Матрицы можно передавать как BitAdjacency или как списки списков (матрицы весов)
+    graph_rows = _rows_of(graph_matrix)
+    user_rows = _rows_of(user_matrix)
+    n = len(user_rows)
+    if len(graph_vertices) != n or len(graph_rows) != n:
+        return
+    if n == 0:
+        yield []
+        return
+    
+    weights = _weight_pair(graph_matrix, user_matrix)
+    for mapping in _iter_mappings(graph_rows, user_rows, control=control, weights=weights):
+        yield [graph_vertices[g] for g in mapping]
+
+
+def solve(graph_matrix, graph_vertices, user_matrix):
+    letters = next(iter_isomorphisms(graph_matrix, graph_vertices, user_matrix), None)
+    if letters is None:
+        return None, None
+    
+    numbers = list(range(1, len(letters) + 1))
+    return numbers, letters
+
+
+def _weight_triples(weights, positions=None):
+    #Рёбра с весом не 1 тройками (i, j, вес), i < j, после перенумерации v -> positions[v]
+    if not weights:
+        return ()
+    triples = []
+    for v, row_weights in enumerate(weights):
+        for w, weight in row_weights.items():
+            a, b = (v, w) if positions is None else (positions[v], positions[w])
+            if a < b:
+                triples.append((a, b, weight))
+    return tuple(sorted(triples))
+
+
+def _iter_monomorphisms(pattern_rows, target_rows, control=None, weights=None):
+    #Вложения образца в целевой граф: разные вершины образца переходят в разные вершины,
+    #рёбра — в рёбра, а лишние рёбра целевого графа допускаются
+    #Выдаёт mapping[вершина образца] = вершина целевого графа
+    #weights — веса (образца, целевого графа): вес ребра при вложении сохраняется
+    n = len(pattern_rows)
+    pattern_weights, target_weights = weights if weights is not None else (None, None)
+    
+    # Домен вершины образца — маска вершин со степенью не меньше
+    # и (для весов) с набором весов, включающим её набор
+    domains = []
+    for u, row in enumerate(pattern_rows):
+        degree = row.bit_count()
+        if weights is not None:
+            signature = Counter(_weight_signature(row, pattern_weights[u]))
+        domain = 0
+        for g, target_row in enumerate(target_rows):
+            if target_row.bit_count() < degree:
+                continue
+            if weights is not None and not signature <= Counter(_weight_signature(target_row, target_weights[g])):
+                continue
+            domain |= 1 << g
+        if not domain:
+            return
+        domains.append(domain)
+    
+    order = _search_order(pattern_rows, [0] * n)
+    mapping = [None] * n
+    
+    def extend(depth, pattern_mapped, target_mapped):
+        if control is not None:
+            control.nodes += 1
+            if control.cancelled:
+                return
+        if depth == n:
+            yield list(mapping)
+            return
+        u = order[depth]
+        # Кандидат обязан быть соседом образов всех уже вложенных соседей u
+        neighbours = list(_bits(pattern_rows[u] & pattern_mapped))
+        allowed = domains[u] & ~target_mapped
+        for w in neighbours:
+            allowed &= target_rows[mapping[w]]
+        # и иметь не меньше свободных соседей, чем осталось у u
+        free = (pattern_rows[u] & ~pattern_mapped).bit_count()
+        for g in _bits(allowed):
+            if (target_rows[g] & ~target_mapped).bit_count() < free:
+                continue
+            if weights is not None and any(
+                target_weights[g].get(mapping[w], 1) != pattern_weights[u].get(w, 1) for w in neighbours
+            ):
+                continue
+            mapping[u] = g
+            yield from extend(depth + 1, pattern_mapped | (1 << u), target_mapped | (1 << g))
+        mapping[u] = None
+    
+    yield from extend(0, 0, 0)
+
+
+def iter_subgraph_isomorphisms(graph_matrix, graph_vertices, user_matrix, control=None):
+    #Режим подграфа: меньший из графов (по вершинам и рёбрам) ищется внутри большего
+    #Для каждого вложения выдаёт список букв по номерам 1..n; если меньше рисунок,
+    #номерам, в которые не попала ни одна вершина, соответствует None
+    graph = _adjacency_of(graph_matrix)
+    user = _adjacency_of(user_matrix)
+    if len(graph_vertices) != len(graph) or subgraph_mismatch(graph, user):
+        return
+    
+    weights = _weight_pair(graph, user)
+    if _pattern_first(graph, user):
+        if weights is not None:
+            weights = weights[::-1]
+        for mapping in _iter_monomorphisms(user.rows, graph.rows, control, weights):
+            yield [graph_vertices[g] for g in mapping]
+    else:
+        for mapping in _iter_monomorphisms(graph.rows, user.rows, control, weights):
+            letters = [None] * len(user)
+            for g, u in enumerate(mapping):
+                letters[u] = graph_vertices[g]
+            yield letters
+
+
+def _certificate(rows, positions, weights=None):
+    #Строки графа и веса рёбер после перенумерации вершин v -> positions[v]
+    canonical = [0] * len(rows)
+    for v, row in enumerate(rows):
+        mask = 0
+        for w in _bits(row):
+            mask |= 1 << positions[w]
+        canonical[positions[v]] = mask
+    return tuple(canonical), _weight_triples(weights, positions)
+
+
+def canonical_form(matrix):
+    #Каноническая нумерация (индивидуализация и уточнение с отсечением по автоморфизмам)
+    #Возвращает (сертификат, labeling): labeling[i] — вершина с каноническим номером i
+    #Сертификат — пара (строки, веса рёбер не 1) в канонической нумерации
+    #У изоморфных графов сертификаты совпадают, у неизоморфных — различны
+    return _canonical_rows(_rows_of(matrix), _weights_of(matrix))
+
+
+def _canonical_rows(rows, weights=None, control=None):
+    #control (SearchControl) считает узлы и прерывает поиск; прерванный результат неполон
+    n = len(rows)
+    pair = (weights, weights) if weights is not None else None
+    first = None
+    best = None
+    generators = []
+    
+    def leaf(positions, path):
+        #Возвращает глубину, на которую можно сразу вернуться, или None
+        nonlocal first, best
+        certificate = _certificate(rows, positions, weights)
+        for reference in (first, best):
+            if reference is not None and reference[0] == certificate:
+                # Два листа с одинаковым сертификатом дают автоморфизм, и всё
+                # поддерево от точки расхождения путей уже просмотрено в его образе
+                inverse = reference[1]
+                generators.append([inverse[positions[v]] for v in range(n)])
+                common = 0
+                while path[common] == reference[2][common]:
+                    common += 1
+                return common
+        labeling = [0] * n
+        for v, pos in enumerate(positions):
+            labeling[pos] = v
+        if first is None:
+            first = (certificate, labeling, path)
+        if best is None or certificate < best[0]:
+            best = (certificate, labeling, path)
+        return None
+    
+    def explore(initial, fixed):
+        if control is not None:
+            control.nodes += 1
+            if control.cancelled:
+                return -1
+        colours = _refine_colours(rows, rows, (initial, initial), weights=pair)[0]
+        cells = {}
+        for v, c in enumerate(colours):
+            cells.setdefault(c, []).append(v)
+        target = min(
+            ((len(cell), c) for c, cell in cells.items() if len(cell) > 1),
+            default=None
+        )
+        if target is None:
+            return leaf(colours, fixed)
+        
+        explored = set()
+        for v in cells[target[1]]:
+            # Ветви из одной орбиты стабилизатора пути дают одинаковые листья
+            stabilizer = [perm for perm in generators if all(perm[p] == p for p in fixed)]
+            if v in explored or any(v in _orbit_of(w, stabilizer) for w in explored):
+                continue
+            explored.add(v)
+            child = initial[:]
+            child[v] = len(fixed) + 1
+            jump = explore(child, fixed + [v])
+            if jump is not None and jump < len(fixed):
+                return jump
+        return None
+    
+    explore([0] * n, [])
+    if best is None:
+        return ((), ()), []
+    return best[:2]
+
+
+class IsomorphismCache:
+    #LRU-кэш по каноническим сертификатам графов
+    #forms: точная копия графа -> каноническая нумерация (повтор без поиска)
+    #groups: сертификат -> порядок группы и орбиты в канонических номерах
+    #Если задан path, кэш читается из JSON-файла и сохраняется в него методом save()
+    
+    def __init__(self, max_size=1024, path=None):
+        self.max_size = max_size
+        self.path = path
+        self.forms = OrderedDict()
+        self.groups = OrderedDict()
+        self.added = []
+        self.lock = threading.Lock()
+        if path is not None and os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            for key, value in data.get("groups", {}).items():
+                self._remember(self.groups, key, value)
+    
+    @staticmethod
+    def graph_key(rows, triples=()):
+        key = f"{len(rows)}:" + ",".join(format(row, 'x') for row in rows)
+        if triples:
+            key += ";" + ",".join(f"{i}-{j}:{weight}" for i, j, weight in triples)
+        return key
+    
+    def _remember(self, table, key, value):
+        table[key] = value
+        table.move_to_end(key)
+        while len(table) > self.max_size:
+            table.popitem(last=False)
+    
+    def canonical(self, matrix, control=None):
+        #Сертификат (строкой) и каноническая нумерация графа
+        #Если поиск отменён через control, возвращает None и ничего не запоминает
+        rows = _rows_of(matrix)
+        weights = _weights_of(matrix)
+        key = self.graph_key(rows, _weight_triples(weights))
+        with self.lock:
+            if key in self.forms:
+                self.forms.move_to_end(key)
+                return self.forms[key]
+        certificate, labeling = _canonical_rows(rows, weights, control)
+        if control is not None and control.cancelled:
+            return None
+        form = (self.graph_key(*certificate), labeling)
+        with self.lock:
+            self._remember(self.forms, key, form)
+        return form
+    
+    def solve(self, graph_matrix, graph_vertices, user_matrix):
+        #То же, что solve(), но через канонические формы: поиск соответствия не нужен
+        n = len(_rows_of(user_matrix))
+        if len(graph_vertices) != n or len(_rows_of(graph_matrix)) != n:
+            return None, None
+        
+        graph_certificate, graph_labeling = self.canonical(graph_matrix)
+        user_certificate, user_labeling = self.canonical(user_matrix)
+        if graph_certificate != user_certificate:
+            return None, None
+        
+        # Вершины с одинаковым каноническим номером соответствуют друг другу
+        letters = [None] * n
+        for graph_v, user_v in zip(graph_labeling, user_labeling):
+            letters[user_v] = graph_vertices[graph_v]
+        return list(range(1, n + 1)), letters
+    
+    def group(self, matrix, control=None):
+        #Орбиты и порядок группы автоморфизмов; для уже встречавшейся формы — из кэша
+        form = self.canonical(matrix, control)
+        if form is None:
+            return [[v] for v in range(len(_rows_of(matrix)))], 1
+        certificate, labeling = form
+        with self.lock:
+            entry = self.groups.get(certificate)
+            if entry is not None:
+                self.groups.move_to_end(certificate)
+        
+        if entry is None:
+            _, orbits, group_order = automorphism_group(matrix, control)
+            if control is not None and control.cancelled:
+                return orbits, group_order
+            position = {v: i for i, v in enumerate(labeling)}
+            entry = {
+                "order": group_order,
+                "orbits": [sorted(position[v] for v in orbit) for orbit in orbits],
+            }
+            with self.lock:
+                self._remember(self.groups, certificate, entry)
+                self.added.append((certificate, entry))
+        
+        orbits = sorted(sorted(labeling[i] for i in orbit) for orbit in entry["orbits"])
+        return orbits, entry["order"]
+    
+    def take_added(self):
+        #Новые записи групп с последнего вызова (для сбора из процессов пула)
+        with self.lock:
+            added, self.added = self.added, []
+        return added
+    
+    def merge(self, entries):
+        with self.lock:
+            for key, value in entries:
+                self._remember(self.groups, key, value)
+    
+    def save(self):
+        if self.path is None:
+            return
+        with self.lock:
+            data = {"groups": dict(self.groups)}
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+
+
+def refinement_hash(matrix):
+    #Хеш хода уточнения раскраски — инвариант графа, устойчивый между запусками
+    rows = _rows_of(matrix)
+    trace = []
+    _refine_colours(rows, rows, trace=trace)
+    return hashlib.sha1(repr(trace).encode()).hexdigest()[:16]
+
+
+class GraphLibrary:
+    #Библиотека эталонных графов с индексом по дешёвым инвариантам:
+    #число вершин и рёбер, последовательность степеней и хеш уточнения раскраски
+    #Полная проверка изоморфизма запускается только для прошедших фильтр
+    
+    def __init__(self, path=None):
+        self.path = path
+        self.entries = []
+        self.index = {}
+        if path is not None and os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                for item in json.load(f):
+                    graph, vertices = parse_graph(item["graph"])
+                    self.add(item["name"], graph, vertices)
+    
+    @staticmethod
+    def invariants(rows):
+        degrees = tuple(sorted(row.bit_count() for row in rows))
+        return len(rows), sum(degrees) // 2, degrees
+    
+    def add(self, name, matrix, vertices=None):
+        graph = BitAdjacency.from_rows(_rows_of(matrix))
+        if vertices is None:
+            vertices = [vertex_name(i) for i in range(len(graph))]
+        entry = {
+            "name": name,
+            "vertices": list(vertices),
+            "graph": graph,
+            "hash": refinement_hash(graph),
+        }
+        self.entries.append(entry)
+        self.index.setdefault(self.invariants(graph.rows), []).append(entry)
+        return entry
+    
+    def candidates(self, matrix):
+        #Записи, у которых совпадают все дешёвые инварианты
+        bucket = self.index.get(self.invariants(_rows_of(matrix)), [])
+        if not bucket:
+            return []
+        wl_hash = refinement_hash(matrix)
+        return [entry for entry in bucket if entry["hash"] == wl_hash]
+    
+    def find(self, matrix, control=None):
+        #Список (имя, буквы): буквы[i] — вершина эталона для вершины i запроса
+        #Эталоны хранят только структуру, поэтому веса запроса не учитываются
+        #control (SearchControl) считает узлы и прерывает проверку кандидатов
+        query = BitAdjacency.from_rows(_rows_of(matrix))
+        found = []
+        for entry in self.candidates(query):
+            if control is not None and control.cancelled:
+                break
+            letters = next(iter_isomorphisms(entry["graph"], entry["vertices"], query, control), None)
+            if letters is not None:
+                found.append((entry["name"], letters))
+        return found
+    
+    def save(self, path=None):
+        path = path or self.path
+        data = []
+        for entry in self.entries:
+            vertices = entry["vertices"]
+            edges = [
+                [vertices[i], vertices[j]]
+                for i, row in enumerate(entry["graph"].rows)
+                for j in _bits(row) if i < j
+            ]
+            data.append({"name": entry["name"], "graph": {"vertices": vertices, "edges": edges}})
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        self.path = path
+
+
+_shard_stop = None
+
+
+def _init_shard_worker(stop_event):
+    #Инициализация процесса пула: общий флаг остановки приходит при создании процесса
+    global _shard_stop
+    _shard_stop = stop_event
+
+
+def _search_shard(graph_rows, user_rows, prefix, find_all, weights=None):
+    #Поиск в одной ветви: вершины из prefix заранее сопоставлены через индивидуализацию
+    user_initial = [0] * len(user_rows)
+    graph_initial = [0] * len(graph_rows)
+    for label, (u, g) in enumerate(prefix, start=1):
+        user_initial[u] = label
+        graph_initial[g] = label
+    
+    control = SearchControl(_shard_stop)
+    found = []
+    for mapping in _iter_mappings(graph_rows, user_rows, (graph_initial, user_initial), control, weights):
+        found.append(mapping)
+        if not find_all:
+            break
+    return found, control.nodes
+
+
+def _search_prefixes(graph_rows, user_rows, workers, weights=None):
+    #Ветви первого уровня (образы первой вершины порядка обхода),
+    #а если их меньше, чем процессов, — пары образов первых двух вершин
+    prepared = _prepare_search(graph_rows, user_rows, weights=weights)
+    if prepared is None:
+        return []
+    candidates, order = prepared
+    
+    u0 = order[0]
+    if candidates[u0].bit_count() < workers and len(order) > 1:
+        u1 = order[1]
+        linked = user_rows[u1] >> u0 & 1
+        return [
+            [(u0, g0), (u1, g1)]
+            for g0 in _bits(candidates[u0])
+            for g1 in _bits(candidates[u1])
+            if g1 != g0 and graph_rows[g1] >> g0 & 1 == linked
+        ]
+    return [[(u0, g0)] for g0 in _bits(candidates[u0])]
+
+
+def parallel_isomorphisms(graph_matrix, graph_vertices, user_matrix,
+                          find_all=False, workers=None, control=None):
+    #Параллельный поиск: ветви первых уровней делятся между процессами пула
+    #Без find_all возвращает не больше одного соответствия, остальные процессы
+    #останавливаются сразу после первой находки
+    graph_rows = _rows_of(graph_matrix)
+    user_rows = _rows_of(user_matrix)
+    n = len(user_rows)
+    if len(graph_vertices) != n or len(graph_rows) != n:
+        return []
+    if n == 0:
+        return [[]]
+    
+    workers = workers or os.cpu_count() or 1
+    weights = _weight_pair(graph_matrix, user_matrix)
+    prefixes = _search_prefixes(graph_rows, user_rows, workers, weights)
+    if not prefixes:
+        return []
+    
+    stop_event = multiprocessing.Event()
+    results = []
+    with ProcessPoolExecutor(workers, initializer=_init_shard_worker, initargs=(stop_event,)) as pool:
+        pending = {
+            pool.submit(_search_shard, graph_rows, user_rows, prefix, find_all, weights)
+            for prefix in prefixes
+        }
+        while pending:
+            done, pending = wait(pending, timeout=SHARD_WAIT_S, return_when=FIRST_COMPLETED)
+            for future in done:
+                found, nodes = future.result()
+                results.extend(found)
+                if control is not None:
+                    control.nodes += nodes
+            if (results and not find_all) or (control is not None and control.cancelled):
+                stop_event.set()
+                for future in pending:
+                    future.cancel()
+                break
+    
+    if not find_all:
+        results = results[:1]
+    return [[graph_vertices[g] for g in mapping] for mapping in results]
+
+
+def _graph_from_edges(vertices, edges):
+    index = {v: i for i, v in enumerate(vertices)}
+    adjacency = BitAdjacency(len(vertices))
+    for u, v, *weight in edges:
+        if u == v:
+            raise ValueError(f"Петля у вершины {u}")
+        adjacency.set_edge(index[u], index[v], weight[0] if weight else True)
+    return adjacency
+
+
+def _check_matrix(matrix):
+    #Матрица смежности должна быть квадратной, симметричной и с нулями на диагонали
+    n = len(matrix)
+    for i, row in enumerate(matrix):
+        if len(row) != n:
+            raise ValueError(f"Строка {i + 1}: {len(row)} значений, а строк в матрице {n}")
+    for i in range(n):
+        if matrix[i][i]:
+            raise ValueError(f"На диагонали в строке {i + 1} стоит {matrix[i][i]}")
+        for j in range(i):
+            if matrix[i][j] != matrix[j][i]:
+                raise ValueError(f"Матрица несимметрична: ячейки {i + 1}-{j + 1} и {j + 1}-{i + 1}")
+
+
+def parse_graph(data):
+    #Граф из JSON: матрица смежности (весов) или {"vertices": [...], "edges": [[u, v], [u, v, вес], ...]}
+    #Возвращает (BitAdjacency, имена вершин)
+    if isinstance(data, dict):
+        edges = data.get("edges", [])
+        vertices = data.get("vertices")
+        if vertices is None:
+            vertices = []
+            for edge in edges:
+                for v in edge[:2]:
+                    if v not in vertices:
+                        vertices.append(v)
+        return _graph_from_edges(vertices, edges), [str(v) for v in vertices]
+    _check_matrix(data)
+    return BitAdjacency.from_matrix(data), [vertex_name(i) for i in range(len(data))]
+
+
+def graph_to_data(graph, vertices, coords=None):
+    #Граф в компактном JSON-виде, который читает parse_graph:
+    #{"vertices": [...], "edges": [[u, v], [u, v, вес], ...], "coords": [[x, y], ...]}
+    graph = _adjacency_of(graph)
+    edges = []
+    for i, row in enumerate(graph.rows):
+        for j in _bits(row):
+            if i < j:
+                weight = graph.weight(i, j)
+                edges.append([vertices[i], vertices[j]] + ([weight] if weight != 1 else []))
+    data = {"vertices": list(vertices), "edges": edges}
+    if coords is not None:
+        data["coords"] = [list(xy) for xy in coords]
+    return data
+
+
+def _parse_cell(cell):
+    #Значение ячейки таблицы: пусто, «-» и «—» — нет ребра
+    if cell in ('', '-', '—'):
+        return 0
+    value = float(cell.replace(',', '.'))
+    return int(value) if value.is_integer() else value
+
+
+def _is_number(cell):
+    try:
+        _parse_cell(cell)
+    except ValueError:
+        return False
+    return True
+
+
+def parse_matrix_text(text):
+    #Матрица из вставленного текста или CSV: разделитель — запятая, точка с запятой,
+    #табуляция или пробелы; строка и столбец заголовков (П1, П2, … или номера) пропускаются
+    #Ошибки формата — ValueError с понятным сообщением
+    rows = []
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        delimiter = next((d for d in (';', '\t', ',') if d in line), None)
+        rows.append([cell.strip() for cell in (line.split(delimiter) if delimiter else line.split())])
+    if not rows:
+        return []
+    
+    # Заголовок — строка хотя бы с одной подписью, пустой угол и номера 1..n
+    # или просто номера 1..n (в тексте через пробелы угла не бывает; строкой
+    # матрицы 1 2 … n быть не может — на диагонали стояла бы 1);
+    # строка из одних пустых ячеек — это вершина 1 без рёбер, а не заголовок
+    numbered = [str(i) for i in range(1, len(rows))]
+    if any(cell and not _is_number(cell) for cell in rows[0]) or rows[0] == numbered or (
+        len(rows[0]) == len(rows) and rows[0][0] == '' and rows[0][1:] == numbered
+    ):
+        rows = rows[1:]
+    if rows and all(len(row) == len(rows) + 1 for row in rows):
+        rows = [row[1:] for row in rows]
+    
+    n = len(rows)
+    matrix = []
+    for i, row in enumerate(rows, start=1):
+        if len(row) != n:
+            raise ValueError(f"Строка {i}: {len(row)} значений, а строк в матрице {n}")
+        try:
+            matrix.append([_parse_cell(cell) for cell in row])
+        except ValueError:
+            raise ValueError(f"Строка {i}: не число среди {row}") from None
+    _check_matrix(matrix)
+    return matrix
+
+
+def format_matrix_text(matrix, delimiter=','):
+    #Обратное к parse_matrix_text: CSV или (с табуляцией) текст для вставки в таблицу
+    return "\n".join(delimiter.join(str(val) for val in row) for row in matrix) + "\n"
+
+
+def parse_edge_list(text):
+    #Список рёбер вида "A-B B-C:7 D": токен без дефиса — изолированная вершина,
+    #число после двоеточия — вес ребра
+    vertices = []
+    edges = []
+    for token in text.split():
+        token, _, weight = token.partition(':')
+        ends = token.split('-')
+        for v in ends:
+            if v not in vertices:
+                vertices.append(v)
+        if len(ends) == 2:
+            edges.append(ends + [int(weight)] if weight else ends)
+    return vertices, edges
+
+
+def parse_job(line, fmt):
+    #Одна пара «граф — матрица» из строки входного файла
+    #jsonl: {"id": ..., "graph": ..., "matrix": ...}
+    #edges: "id; A-B B-C C-A; 1-2 2-3 3-1" (вершины матрицы — номера 1..n, вес — "1-2:5")
+    if fmt == "jsonl":
+        data = json.loads(line)
+        return data.get("id"), data["graph"], data["matrix"]
+    
+    job_id, graph_part, matrix_part = [part.strip() for part in line.split(';')]
+    graph_vertices, graph_edges = parse_edge_list(graph_part)
+    numbers, matrix_edges = parse_edge_list(matrix_part)
+    n = max((int(v) for v in numbers), default=0)
+    for v in numbers:
+        if not 1 <= int(v) <= n:
+            raise ValueError(f"Номер вершины матрицы {v} вне диапазона 1..{n}")
+    matrix = [[0] * n for _ in range(n)]
+    for u, v, *weight in matrix_edges:
+        matrix[int(u) - 1][int(v) - 1] = matrix[int(v) - 1][int(u) - 1] = weight[0] if weight else 1
+    return job_id, {"vertices": graph_vertices, "edges": graph_edges}, matrix
+
+
+def solve_job(job, count=False, cache=None):
+    #Решение одной пары для пакетного режима, результат — словарь для JSON
+    job_id, graph_data, matrix_data = job
+    graph, vertices = parse_graph(graph_data)
+    user, _ = parse_graph(matrix_data)
+    result = {"id": job_id}
+    
+    if cache is not None:
+        _, letters = cache.solve(graph, vertices, user)
+    else:
+        _, letters = solve(graph, vertices, user)
+    result["isomorphic"] = letters is not None
+    if letters is not None:
+        result["mapping"] = {str(i + 1): letter for i, letter in enumerate(letters)}
+        if count:
+            result["count"] = cache.group(graph)[1] if cache is not None else automorphism_group(graph)[2]
+    return result
+
+
+_batch_cache = None
+
+
+def _init_batch_worker(cache_path):
+    #Каждый процесс пула читает общий файл кэша при старте
+    global _batch_cache
+    if cache_path is not None:
+        _batch_cache = IsomorphismCache(path=cache_path)
+
+
+def _solve_line(line, fmt, count):
+    #Результат строки и новые записи кэша, которые главный процесс сохранит в файл
+    try:
+        result = solve_job(parse_job(line, fmt), count, _batch_cache)
+    except Exception as e:
+        result = {"line": line, "error": str(e)}
+    added = _batch_cache.take_added() if _batch_cache is not None else []
+    return result, added
+
+
+def main(argv=None):
+    #Пакетная проверка пар из файла: результаты построчно в stdout, скорость — в stderr
+    parser = argparse.ArgumentParser(description="Пакетная проверка изоморфизма графа и матрицы смежности")
+    parser.add_argument("path", help="файл с парами (jsonl или список рёбер), '-' — stdin")
+    parser.add_argument("--format", choices=["jsonl", "edges"], help="формат входа (по умолчанию — по расширению)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="число процессов")
+    parser.add_argument("--count", action="store_true", help="выводить число всех соответствий")
+    parser.add_argument("--cache", help="JSON-файл кэша канонических форм (читается и дополняется)")
+    args = parser.parse_args(argv)
+    
+    fmt = args.format or ("jsonl" if args.path.endswith((".jsonl", ".json")) else "edges")
+    cache = IsomorphismCache(path=args.cache) if args.cache else None
+    
+    def collect(solved):
+        #Новые записи кэша из процесса пула сохраняются в общий кэш
+        result, added = solved
+        if cache is not None:
+            cache.merge(added)
+        return result
+    
+    run_batch(
+        args.path, args.workers, _solve_line, (fmt, args.count),
+        initializer=_init_batch_worker, initargs=(args.cache,), on_result=collect, unit="пар"
+    )
+    
+    if cache is not None:
+        cache.save()
+
+
+if __name__ == '__main__':
+    main()
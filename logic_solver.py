@@ -0,0 +1,628 @@
+# Решение задач на отрезки и ДЕЛ без Qt: используется окном 15.py и пакетным режимом
+import argparse
+import ast
+import functools
+import json
+import math
+import operator
+import os
+
+from batch_runner import run_batch
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Всё, что может встретиться в формуле: логика, сравнения (<= — импликация), x in P
+FORMULA_NODES = (
+    ast.Expression, ast.BoolOp, ast.And, ast.Or, ast.UnaryOp, ast.Not, ast.USub, ast.UAdd,
+    ast.Compare, ast.In, ast.NotIn, ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE,
+    ast.Name, ast.Load, ast.Constant,
+)
+
+# В целочисленном режиме ещё ДЕЛ(n, m), x & A и x % A
+INTEGER_NODES = FORMULA_NODES + (ast.Call, ast.BinOp, ast.BitAnd, ast.Mod)
+
+
+def divides(n, m):
+    # ДЕЛ(n, m) — n делится на m без остатка; одинаково для чисел и массивов NumPy
+    return n % m == 0
+
+
+INTEGER_NAMES = {"DEL": divides, "ДЕЛ": divides}
+
+
+def parse_formula(expression, intervals=None, nodes=FORMULA_NODES):
+    try:
+        tree = ast.parse(expression, mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Ошибка в формуле: {e.msg}")
+    
+    for node in ast.walk(tree):
+        if not isinstance(node, nodes):
+            raise ValueError(f"Ошибка в формуле: недопустимая конструкция {type(node).__name__}")
+        # Без таблицы (для диаграммы, общей для всех таблиц) имена не проверяются
+        if isinstance(node, ast.Name) and intervals is not None \
+                and node.id not in intervals and node.id not in ("x", "A"):
+            raise ValueError(f"Ошибка в формуле: неизвестное имя {node.id}")
+        if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float)):
+            raise ValueError(f"Ошибка в формуле: недопустимое значение {node.value!r}")
+    return tree.body
+
+
+def formula_function(body, names):
+    # Тело формулы превращается в функцию lambda x, A: ...,
+    # интервалы и вспомогательные функции — её глобальные имена
+    arguments = ast.arguments(
+        posonlyargs=[], args=[ast.arg("x"), ast.arg("A")],
+        kwonlyargs=[], kw_defaults=[], defaults=[]
+    )
+    function = ast.fix_missing_locations(ast.Expression(ast.Lambda(arguments, body)))
+    code = compile(function, "<формула>", "eval")
+    return eval(code, {"__builtins__": {}, **names})
+
+
+def compares_x(body):
+    # Есть ли сравнения вроде x < 5: их границы не совпадают с концами интервалов
+    # (<= между логическими значениями — импликация, она сюда не относится)
+    for node in ast.walk(body):
+        if isinstance(node, ast.Compare):
+            operands = [node.left] + node.comparators
+            for op, left, right in zip(node.ops, operands, operands[1:]):
+                if isinstance(op, (ast.In, ast.NotIn)):
+                    continue
+                if any(isinstance(side, ast.Name) and side.id == "x" for side in (left, right)):
+                    return True
+    return False
+
+
+def _call(name, *args):
+    return ast.Call(ast.Name(name, ast.Load()), list(args), [])
+
+
+def _within(xs, interval):
+    left = xs >= interval.start if interval.left_closed else xs > interval.start
+    right = xs <= interval.end if interval.right_closed else xs < interval.end
+    return left & right
+
+
+class VectorFormula(ast.NodeTransformer):
+    # Переводит проверенную формулу в операции над массивами NumPy:
+    # x in P -> (xs >= P.start) & (xs <= P.end), x in A -> маска A,
+    # and/or/not -> logical_and/or/not, цепочки сравнений -> logical_and пар
+
+    def visit_BoolOp(self, node):
+        self.generic_visit(node)
+        name = "_and" if isinstance(node.op, ast.And) else "_or"
+        result = node.values[0]
+        for value in node.values[1:]:
+            result = _call(name, result, value)
+        return result
+
+    def visit_UnaryOp(self, node):
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Not):
+            return _call("_not", node.operand)
+        return node
+
+    def visit_Compare(self, node):
+        self.generic_visit(node)
+        parts = []
+        left = node.left
+        for op, right in zip(node.ops, node.comparators):
+            if isinstance(op, (ast.In, ast.NotIn)):
+                if isinstance(right, ast.Name) and right.id == "A":
+                    part = right
+                else:
+                    part = _call("_within", left, right)
+                if isinstance(op, ast.NotIn):
+                    part = _call("_not", part)
+            else:
+                part = ast.Compare(left, [op], [right])
+            parts.append(part)
+            left = right
+        result = parts[0]
+        for part in parts[1:]:
+            result = _call("_and", result, part)
+        return result
+
+
+def compile_vector_formula(expression, intervals, nodes=FORMULA_NODES):
+    if np is None:
+        raise ValueError("Для расчёта по сетке нужен пакет numpy")
+    body = VectorFormula().visit(parse_formula(expression, intervals, nodes))
+    helpers = {"_and": np.logical_and, "_or": np.logical_or, "_not": np.logical_not, "_within": _within}
+    return formula_function(body, {**intervals, **helpers})
+
+
+# Множества точек оси — отсортированные непересекающиеся куски (начало, конец),
+# концы — ключи (v, -1) «сразу перед v», (v, 0) «сама точка v», (v, 1) «сразу после v»,
+# поэтому открытые и закрытые концы сравниваются как обычные кортежи
+INF = float("inf")
+FULL_LINE = [((-INF, 1), (INF, -1))]
+
+# Сравнение x с числом, записанное как «x оп c»; при c оп x знак разворачивается
+FLIPPED = {ast.Lt: ast.Gt, ast.LtE: ast.GtE, ast.Gt: ast.Lt, ast.GtE: ast.LtE, ast.Eq: ast.Eq, ast.NotEq: ast.NotEq}
+
+BOOL_OPERATORS = {
+    ast.Eq: operator.eq, ast.NotEq: operator.ne, ast.Lt: operator.lt,
+    ast.LtE: operator.le, ast.Gt: operator.gt, ast.GtE: operator.ge,
+}
+
+
+def region_intersection(first, second):
+    result = []
+    i = j = 0
+    while i < len(first) and j < len(second):
+        low = max(first[i][0], second[j][0])
+        high = min(first[i][1], second[j][1])
+        if low <= high:
+            result.append((low, high))
+        if first[i][1] < second[j][1]:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+def region_union(first, second):
+    result = []
+    for low, high in sorted(first + second):
+        # Куски сливаются, если пересекаются или примыкают: (v, 0) и (v, 1), (v, -1) и (v, 0)
+        if result and low <= (result[-1][1][0], result[-1][1][1] + 1):
+            if high > result[-1][1]:
+                result[-1] = (result[-1][0], high)
+        else:
+            result.append((low, high))
+    return result
+
+
+def region_complement(region):
+    result = []
+    start = FULL_LINE[0][0]
+    for low, high in region:
+        end = (low[0], low[1] - 1)
+        if start <= end:
+            result.append((start, end))
+        start = (high[0], high[1] + 1)
+    if start <= FULL_LINE[0][1]:
+        result.append((start, FULL_LINE[0][1]))
+    return result
+
+
+def atom_region(atom, intervals):
+    if atom[0] == "in":
+        interval = intervals[atom[1]]
+        low = (interval.start, 0 if interval.left_closed else 1)
+        high = (interval.end, 0 if interval.right_closed else -1)
+        return [(low, high)] if low <= high else []
+    
+    _, op, c = atom
+    if op is ast.Lt:
+        return [((-INF, 1), (c, -1))]
+    if op is ast.LtE:
+        return [((-INF, 1), (c, 0))]
+    if op is ast.Gt:
+        return [((c, 1), (INF, -1))]
+    if op is ast.GtE:
+        return [((c, 0), (INF, -1))]
+    point = [((c, 0), (c, 0))]
+    return point if op is ast.Eq else region_complement(point)
+
+
+class FormulaDiagram:
+    # Сокращённая диаграмма решений формулы над атомами:
+    # ("in", P) — x in P, ("A",) — x in A, ("cmp", оператор, c) — x оп c
+    # Узлы хранятся номерами: 0 и 1 — листья «ложь» и «истина»,
+    # остальные — (номер атома, ветвь «ложь», ветвь «истина») в nodes
+    # Диаграмма не зависит от таблицы интервалов и строится один раз на формулу
+
+    def __init__(self, expression):
+        self.atoms = []
+        self.atom_index = {}
+        self.nodes = [None, None]
+        self.unique = {}
+        self.memo = {}
+        self.root = self.build(parse_formula(expression))
+
+    def node(self, var, low, high):
+        if low == high:
+            return low
+        key = (var, low, high)
+        if key not in self.unique:
+            self.unique[key] = len(self.nodes)
+            self.nodes.append(key)
+        return self.unique[key]
+
+    def atom(self, atom):
+        if atom not in self.atom_index:
+            self.atom_index[atom] = len(self.atoms)
+            self.atoms.append(atom)
+        return self.node(self.atom_index[atom], 0, 1)
+
+    def apply(self, op, u, v):
+        if u <= 1 and v <= 1:
+            return int(op(bool(u), bool(v)))
+        key = (op, u, v)
+        if key not in self.memo:
+            var_u = self.nodes[u][0] if u > 1 else INF
+            var_v = self.nodes[v][0] if v > 1 else INF
+            var = min(var_u, var_v)
+            u_low, u_high = self.nodes[u][1:] if var_u == var else (u, u)
+            v_low, v_high = self.nodes[v][1:] if var_v == var else (v, v)
+            self.memo[key] = self.node(var, self.apply(op, u_low, v_low), self.apply(op, u_high, v_high))
+        return self.memo[key]
+
+    def negate(self, u):
+        return self.apply(operator.xor, u, 1)
+
+    def build(self, node):
+        if isinstance(node, ast.BoolOp):
+            op = operator.and_ if isinstance(node.op, ast.And) else operator.or_
+            return functools.reduce(lambda u, v: self.apply(op, u, self.build(v)), node.values[1:], self.build(node.values[0]))
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            return self.negate(self.build(node.operand))
+        if isinstance(node, ast.Constant):
+            return int(bool(node.value))
+        if isinstance(node, ast.Compare):
+            operands = [node.left] + node.comparators
+            parts = [self.compare(op, left, right) for op, left, right in zip(node.ops, operands, operands[1:])]
+            return functools.reduce(lambda u, v: self.apply(operator.and_, u, v), parts)
+        raise ValueError(f"Ошибка в формуле: {ast.unparse(node)} не является условием")
+
+    def compare(self, op, left, right):
+        if isinstance(op, (ast.In, ast.NotIn)):
+            if not (is_x(left) and isinstance(right, ast.Name) and right.id != "x"):
+                raise ValueError(f"Ошибка в формуле: ожидалось x in ..., а не {ast.unparse(left)} in ...")
+            u = self.atom(("A",) if right.id == "A" else ("in", right.id))
+            return self.negate(u) if isinstance(op, ast.NotIn) else u
+        
+        left_number, right_number = number_value(left), number_value(right)
+        if is_x(left) and right_number is not None:
+            return self.atom(("cmp", type(op), right_number))
+        if is_x(right) and left_number is not None:
+            return self.atom(("cmp", FLIPPED[type(op)], left_number))
+        if left_number is not None and right_number is not None:
+            return int(BOOL_OPERATORS[type(op)](left_number, right_number))
+        # Сравнение логических значений: <= — импликация, == — эквивалентность
+        return self.apply(BOOL_OPERATORS[type(op)], self.build(left), self.build(right))
+
+    def region(self, a_value, wanted, intervals):
+        # Точки x, где формула при (x in A) = a_value равна wanted
+        memo = {}
+        
+        def walk(u):
+            if u <= 1:
+                return FULL_LINE if bool(u) == wanted else []
+            if u not in memo:
+                var, low, high = self.nodes[u]
+                atom = self.atoms[var]
+                if atom == ("A",):
+                    memo[u] = walk(high if a_value else low)
+                else:
+                    inside = atom_region(atom, intervals)
+                    memo[u] = region_union(
+                        region_intersection(inside, walk(high)),
+                        region_intersection(region_complement(inside), walk(low))
+                    )
+            return memo[u]
+        
+        return walk(self.root)
+
+
+def is_x(node):
+    return isinstance(node, ast.Name) and node.id == "x"
+
+
+def number_value(node):
+    # Число из константы или константы с унарным минусом, иначе None
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        value = number_value(node.operand)
+        if value is None:
+            return None
+        return -value if isinstance(node.op, ast.USub) else value
+    if isinstance(node, ast.Constant) and not isinstance(node.value, bool):
+        return float(node.value)
+    return None
+
+
+@functools.lru_cache(maxsize=256)
+def compile_diagram(expression):
+    return FormulaDiagram(expression)
+
+
+class Interval:
+    def __init__(self, name, start, end, left_closed=True, right_closed=True):
+        self.name = name
+        self.start = float(start)
+        self.end = float(end)
+        self.left_closed = left_closed
+        self.right_closed = right_closed
+
+    def __contains__(self, item):
+        if item < self.start or item > self.end:
+            return False
+        return (item != self.start or self.left_closed) and (item != self.end or self.right_closed)
+
+    def bounds_text(self, digits=2):
+        left = "[" if self.left_closed else "("
+        right = "]" if self.right_closed else ")"
+        return f"{left}{self.start:.{digits}f}, {self.end:.{digits}f}{right}"
+
+    def __repr__(self):
+        return f"{self.name}: {self.bounds_text()}"
+
+
+class LogicSolver:
+    def __init__(self, expression, intervals, search_range=(0, 100), step=0.5, tolerance=1e-9):
+        self.expression = expression
+        self.intervals = {i.name: i for i in intervals} 
+        self.search_range = search_range
+        self.step = step
+        self.tolerance = tolerance
+        # Формула разбирается один раз, дальше каждая точка — обычный вызов функции
+        body = parse_formula(expression, self.intervals)
+        self.formula = formula_function(body, self.intervals)
+        self.compares_x = compares_x(body)
+        self.vector_formula = None
+
+    def check_expression(self, x, a_val_bool):
+        try:
+            return bool(self.formula(x, (x,) if a_val_bool else ()))
+        except Exception as e:
+            raise ValueError(f"Ошибка в формуле: {e}")
+
+    def breakpoints(self):
+        low, high = self.search_range
+        points = {float(low), float(high)}
+        for interval in self.intervals.values():
+            points.update(p for p in (interval.start, interval.end) if low <= p <= high)
+        return sorted(points)
+
+    def condition_met(self, x, mode, target_value):
+        if mode == "min":
+            return self.check_expression(x, False) != target_value
+        return self.check_expression(x, True) == target_value
+
+    def bisect(self, low, high, low_value, mode, target_value):
+        # Сужает [low, high] вокруг смены значения условия до tolerance
+        while high - low > self.tolerance:
+            middle = (low + high) / 2
+            if middle in (low, high):
+                break
+            if self.condition_met(middle, mode, target_value) == low_value:
+                low = middle
+            else:
+                high = middle
+        return low, high
+
+    def runs(self, mode, target_value):
+        # Куски оси с постоянным условием: (начало, конец, начало включено, конец включено, условие)
+        # Без сравнений с x формула постоянна между концами интервалов — хватает
+        # одной точки на промежуток; со сравнениями промежуток просматривается
+        # с шагом step, а каждая смена значения уточняется делением пополам
+        points = self.breakpoints()
+        for left, right in zip(points, points[1:]):
+            yield left, left, True, True, self.condition_met(left, mode, target_value)
+            
+            count = max(1, math.ceil((right - left) / self.step)) if self.compares_x else 1
+            xs = [left + (right - left) * (k + 0.5) / count for k in range(count)]
+            values = [self.condition_met(x, mode, target_value) for x in xs]
+            start, start_closed = left, False
+            for k in range(1, count):
+                if values[k] != values[k - 1]:
+                    low, high = self.bisect(xs[k - 1], xs[k], values[k - 1], mode, target_value)
+                    yield start, low, start_closed, True, values[k - 1]
+                    start, start_closed = high, True
+            yield start, right, start_closed, False, values[-1]
+        
+        yield points[-1], points[-1], True, True, self.condition_met(points[-1], mode, target_value)
+
+    def solve(self, mode="min", target_value=True):
+        # Ответ берётся из алгебры множеств по диаграмме формулы; формулы,
+        # которые диаграмма не разбирает (например, 5 in P), решаются просмотром оси
+        try:
+            diagram = compile_diagram(self.expression)
+        except ValueError:
+            return self.solve_scan(mode, target_value)
+        
+        if mode == "min":
+            region = diagram.region(False, not target_value, self.intervals)
+        else:
+            region = diagram.region(True, target_value, self.intervals)
+        low, high = self.search_range
+        region = region_intersection(region, [((float(low), 0), (float(high), 0))])
+        if not region:
+            return None
+        
+        start, end = region[0] if mode == "min" else region[-1]
+        return Interval("A (Result)", start[0], end[0], start[1] == 0, end[1] == 0)
+
+    def solve_scan(self, mode="min", target_value=True):
+        segments = []
+        start = None
+        end = None
+        
+        for left, right, left_closed, right_closed, met in self.runs(mode, target_value):
+            if met:
+                if start is None:
+                    start = (left, left_closed)
+                end = (right, right_closed)
+            elif start is not None:
+                segments.append((start, end))
+                start = None
+        
+        if start is not None:
+            segments.append((start, end))
+        
+        if not segments:
+            return None
+        
+        (a_start, left_closed), (a_end, right_closed) = segments[0] if mode == "min" else segments[-1]
+        return Interval("A (Result)", a_start, a_end, left_closed, right_closed)
+
+    def sample(self, step=0.001):
+        # Значения формулы на всей сетке x: без A и с A — за один векторный проход
+        if self.vector_formula is None:
+            self.vector_formula = compile_vector_formula(self.expression, self.intervals)
+        low, high = self.search_range
+        xs = np.arange(round((high - low) / step) + 1) * step + low
+        n = len(xs)
+        a_mask = np.arange(2 * n) >= n
+        values = np.broadcast_to(self.vector_formula(np.concatenate((xs, xs)), a_mask), (2 * n,))
+        return xs, values[:n], values[n:]
+
+    def solve_grid(self, mode="min", target_value=True, step=0.001):
+        xs, without_a, with_a = self.sample(step)
+        if mode == "min":
+            mask = without_a != target_value
+        else:
+            mask = with_a == target_value
+        
+        # Начала и концы отрезков — места, где маска меняет значение
+        changes = np.flatnonzero(np.diff(np.concatenate(([0], mask.astype(np.int8), [0]))))
+        if len(changes) == 0:
+            return None
+        starts, ends = changes[0::2], changes[1::2] - 1
+        index = 0 if mode == "min" else -1
+        return Interval("A (Result)", xs[starts[index]], xs[ends[index]])
+
+
+class IntegerSolver:
+    # Задачи с ДЕЛ(x, A) и x & A: A — натуральное число из a_range, формула
+    # должна принимать значение target_value при всех натуральных x до x_limit
+    prefix = 4096
+    block = 1 << 16
+    group = 256
+
+    def __init__(self, expression, intervals=(), x_limit=100000, a_range=(1, 1000)):
+        self.expression = expression
+        self.intervals = {i.name: i for i in intervals}
+        self.names = {**self.intervals, **INTEGER_NAMES}
+        self.x_limit = x_limit
+        low, high = a_range
+        if low < 1 or low > high:
+            raise ValueError(f"Диапазон A должен быть натуральным: от 1 и не пустой, а не {low}..{high}")
+        self.a_range = a_range
+        body = parse_formula(expression, self.names, INTEGER_NODES)
+        for node in ast.walk(body):
+            if isinstance(node, ast.Compare) and any(
+                    isinstance(op, (ast.In, ast.NotIn)) and isinstance(right, ast.Name) and right.id == "A"
+                    for op, right in zip(node.ops, node.comparators)):
+                raise ValueError("Ошибка в формуле: здесь A — число, а не отрезок")
+        self.formula = formula_function(body, self.names)
+        self.vector_formula = None
+
+    def check_expression(self, x, a_value):
+        try:
+            return bool(self.formula(x, a_value))
+        except Exception as e:
+            raise ValueError(f"Ошибка в формуле: {e}")
+
+    def candidates(self, mode):
+        low, high = self.a_range
+        return range(low, high + 1) if mode == "min" else range(high, low - 1, -1)
+
+    def holds(self, xs, a_values, target_value):
+        # Строка xs против столбца a_values: для каждого A — верна ли формула на всех xs
+        try:
+            values = self.vector_formula(xs[None, :], a_values[:, None])
+        except Exception as e:
+            raise ValueError(f"Ошибка в формуле: {e}")
+        values = np.broadcast_to(values, (len(a_values), len(xs)))
+        return np.all(values == target_value, axis=1)
+
+    def solve(self, mode="min", target_value=True):
+        if np is None:
+            return self.solve_scan(mode, target_value)
+        if self.vector_formula is None:
+            self.vector_formula = compile_vector_formula(self.expression, self.names, INTEGER_NODES)
+        
+        xs = np.arange(1, self.x_limit + 1, dtype=np.int64)
+        candidates = np.array(self.candidates(mode), dtype=np.int64)
+        # Кандидаты идут группами: вся группа разом проверяется на первых prefix
+        # значениях x, где отсеиваются почти все неподходящие A; оставшиеся по
+        # порядку проверяются на остальной оси кусками до первого нарушения
+        for first in range(0, len(candidates), self.group):
+            group = candidates[first:first + self.group]
+            for a in group[self.holds(xs[:self.prefix], group, target_value)]:
+                a_values = np.array([a])
+                if all(self.holds(xs[start:start + self.block], a_values, target_value)[0]
+                       for start in range(self.prefix, self.x_limit, self.block)):
+                    return int(a)
+        return None
+
+    def solve_scan(self, mode="min", target_value=True):
+        # Без numpy — те же проверки по одной точке
+        for a in self.candidates(mode):
+            if all(self.check_expression(x, a) == target_value for x in range(1, self.x_limit + 1)):
+                return a
+        return None
+
+
+def search_range_for(intervals):
+    # Ось поиска по умолчанию — от 0 до полутора правых концов интервалов
+    all_coords = [i.end for i in intervals]
+    return (0, max(all_coords) * 1.5 if all_coords else 100)
+
+
+def parse_job(line):
+    # Одна задача из строки JSON:
+    # {"id": ..., "formula": "...", "intervals": {"P": [0, 20], "Q": [10, 30, true, false]},
+    #  "mode": "min" | "max", "target": true, "range": [0, 100]}
+    # С "grid_step": h ответ ищется по сетке с шагом h (numpy) — для сверки с точным
+    # Задачи на ДЕЛ и x & A — "domain": "integer", "x_limit": N, "a_range": [1, 1000]
+    data = json.loads(line)
+    intervals = [Interval(name, *bounds) for name, bounds in data.get("intervals", {}).items()]
+    return data.get("id"), data["formula"], intervals, data
+
+
+def solve_job(job):
+    # Решение одной задачи для пакетного режима, результат — словарь для JSON
+    job_id, formula, intervals, data = job
+    mode = data.get("mode", "min")
+    target_value = bool(data.get("target", True))
+    result = {"id": job_id}
+    
+    if data.get("domain", "real") == "integer":
+        solver = IntegerSolver(formula, intervals, data.get("x_limit", 100000), tuple(data.get("a_range", (1, 1000))))
+        result["A"] = solver.solve(mode, target_value)
+        return result
+    
+    search_range = tuple(data["range"]) if "range" in data else search_range_for(intervals)
+    solver = LogicSolver(formula, intervals, search_range=search_range)
+    if "grid_step" in data:
+        answer = solver.solve_grid(mode, target_value, float(data["grid_step"]))
+    else:
+        answer = solver.solve(mode, target_value)
+    result["found"] = answer is not None
+    if answer is not None:
+        result["start"] = answer.start
+        result["end"] = answer.end
+        result["left_closed"] = answer.left_closed
+        result["right_closed"] = answer.right_closed
+        result["length"] = answer.end - answer.start
+    return result
+
+
+def _solve_line(line):
+    try:
+        return solve_job(parse_job(line))
+    except Exception as e:
+        return {"line": line, "error": str(e)}
+
+
+def main(argv=None):
+    # Пакетное решение задач из файла: результаты построчно в stdout, скорость — в stderr
+    parser = argparse.ArgumentParser(description="Пакетное решение задач на отрезки и ДЕЛ")
+    parser.add_argument("path", help="файл с задачами в формате jsonl, '-' — stdin")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="число процессов")
+    args = parser.parse_args(argv)
+    
+    run_batch(args.path, args.workers, _solve_line, unit="задач")
+
+
+if __name__ == '__main__':
+    main()